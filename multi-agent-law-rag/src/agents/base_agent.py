@@ -5,6 +5,22 @@ Abstract base agent class for multi-agent system.
 from abc import ABC, abstractmethod
 from typing import Dict, Any
 import asyncio
+import weakref
+
+from ..config import settings
+
+# One LLM concurrency limiter per event loop (asyncio primitives are loop-bound)
+_llm_semaphores = weakref.WeakKeyDictionary()
+
+
+def _get_llm_semaphore() -> asyncio.Semaphore:
+    """Get the semaphore bounding concurrent LLM calls on the running loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _llm_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(settings.MAX_CONCURRENT_LLM_CALLS)
+        _llm_semaphores[loop] = semaphore
+    return semaphore
 
 
 class BaseAgent(ABC):
@@ -34,6 +50,36 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def aexecute(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute agent logic asynchronously.
+
+        Default runs execute() in a worker thread; agents with native async
+        I/O (e.g. LLM ainvoke) override this to skip the thread hop.
+
+        Args:
+            state: Current state
+
+        Returns:
+            dict: Partial state update
+        """
+        return await asyncio.to_thread(self.execute, state)
+
+    async def ainvoke_llm(self, prompt, llm=None, **kwargs):
+        """
+        Await an LLM on a prompt, bounded by MAX_CONCURRENT_LLM_CALLS across all agents.
+
+        Args:
+            prompt: Prompt (string or messages)
+            llm: Chat model to call (defaults to self.llm)
+            **kwargs: Extra request parameters passed to the model
+
+        Returns:
+            LLM response message
+        """
+        async with _get_llm_semaphore():
+            return await (llm or self.llm).ainvoke(prompt, **kwargs)
+
     async def execute_with_timeout(self, state: Dict[str, Any], timeout: int = 30) -> Dict[str, Any]:
         """
         Execute agent with timeout.
@@ -43,20 +89,15 @@ class BaseAgent(ABC):
             timeout: Timeout in seconds
 
         Returns:
-            dict: Updated state
+            dict: Partial state update
         """
         try:
-            return await asyncio.wait_for(
-                asyncio.to_thread(self.execute, state),
-                timeout=timeout
-            )
+            return await asyncio.wait_for(self.aexecute(state), timeout=timeout)
         except asyncio.TimeoutError:
-            # Return state with error
-            state['error'] = f"{self.name} timed out after {timeout}s"
-            return state
+            # Return a partial update carrying the error
+            return {"error": f"{self.name} timed out after {timeout}s"}
         except Exception as e:
-            state['error'] = f"{self.name} failed: {str(e)}"
-            return state
+            return {"error": f"{self.name} failed: {str(e)}"}
 
     def validate_input(self, state: Dict[str, Any]) -> bool:
         """
@@ -69,11 +110,9 @@ class BaseAgent(ABC):
             bool: True if valid
         """
         # Basic validation - subclasses can override
-        if not isinstance(state, dict):
-            return False
-        if 'query' not in state:
-            return False
-        return True
+        if isinstance(state, dict):
+            return 'query' in state
+        return hasattr(state, 'query')
 
     def __str__(self):
         return f"{self.__class__.__name__}({self.name})"
@@ -2,19 +2,38 @@
 LangGraph multi-agent orchestration with parallel execution.
 """
 
-from typing import Dict, Any
+import asyncio
+import hashlib
+from functools import lru_cache
+from typing import AsyncIterator, Dict, Any, Iterator
 from langgraph.graph import StateGraph, END
 
+try:
+    import uvloop
+except ImportError:  # uvloop is optional (not available on Windows)
+    uvloop = None
+
 from .state import MultiAgentState, create_initial_state
 from .rag_agent import rag_agent
 from .temporal_agent import temporal_agent
 from .supervisor_agent import supervisor_agent
 from ..config import settings
 
+# Event loop shared by every synchronous query (created on first use)
+_event_loop = None
+
+# Queries currently being answered: sha256(query) -> Future with the result
+_inflight: Dict[str, asyncio.Future] = {}
+
 
+@lru_cache(maxsize=None)
 def create_multi_agent_graph():
     """
-    Create multi-agent graph with parallel execution.
+    Get the multi-agent graph with parallel execution.
+
+    The graph is compiled once per process and reused for every query.
+    Settings are frozen, so the ENABLE_* agent flags are read from the
+    environment at startup; changing them takes a process restart.
 
     Returns:
         Compiled LangGraph workflow
@@ -23,15 +42,15 @@ def create_multi_agent_graph():
     workflow = StateGraph(MultiAgentState)
 
     # Add a dispatcher node to fan out to all agents
-    def dispatcher(state: MultiAgentState) -> MultiAgentState:
-        """Pass-through dispatcher that initiates parallel execution."""
-        return state
+    def dispatcher(state: MultiAgentState) -> None:
+        """Pass-through dispatcher that initiates parallel execution (no state update)."""
+        return None
 
     # Add nodes
     workflow.add_node("dispatcher", dispatcher)
-    workflow.add_node("rag", rag_agent.execute)
-    workflow.add_node("temporal", temporal_agent.execute)
-    workflow.add_node("supervisor", supervisor_agent.execute)
+    workflow.add_node("rag", rag_agent.aexecute)
+    workflow.add_node("temporal", temporal_agent.aexecute)
+    workflow.add_node("supervisor", supervisor_agent.aexecute)
 
     # Set single entry point (dispatcher)
     workflow.set_entry_point("dispatcher")
@@ -63,51 +82,151 @@ async def run_multi_agent_query(query: str) -> Dict[str, Any]:
     """
     Run multi-agent query asynchronously.
 
+    Identical queries that arrive while one is already running share its
+    result (single-flight) instead of running the whole graph again.
+
     Args:
         query: User query
 
     Returns:
         dict: Result with answer, confidence, sources, primary_source
     """
+    key = hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    inflight = _inflight.get(key)
+    if inflight is not None:
+        # shield: a cancelled follower must not cancel the leader's query
+        return dict(await asyncio.shield(inflight))
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+
+    try:
+        result = await _run_multi_agent_query(query)
+        future.set_result(result)
+        return result
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark retrieved so an unawaited failure isn't logged twice
+        raise
+    finally:
+        del _inflight[key]
+
+
+async def _run_multi_agent_query(query: str) -> Dict[str, Any]:
+    """Run the multi-agent graph for one query (no deduplication)."""
     # Create initial state
     initial_state = create_initial_state(query)
 
-    # Get compiled graph
+    # Get compiled graph (cached after the first query)
     graph = create_multi_agent_graph()
 
     # Run graph (agents execute in parallel)
     result = await graph.ainvoke(initial_state)
 
-    # Extract relevant results
+    # Extract relevant results (plain Python floats, so the result stays
+    # JSON-serializable even though scores are computed with NumPy)
     return {
         "answer": result.get("final_answer", ""),
-        "confidence": result.get("confidence_score", 0.0),
+        "confidence": float(result.get("confidence_score", 0.0)),
         "sources": result.get("citations", []),
         "primary_source": result.get("primary_source", ""),
-        "rag_confidence": result.get("rag_confidence", 0.0),
-        "temporal_confidence": result.get("temporal_confidence", 0.0),
+        "rag_confidence": float(result.get("rag_confidence", 0.0)),
+        "temporal_confidence": float(result.get("temporal_confidence", 0.0)),
         "rag_source_metadata": result.get("rag_source_metadata", None),
     }
 
 
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the persistent event loop used for synchronous queries (uvloop if available)."""
+    global _event_loop
+
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
+    return _event_loop
+
+
 def run_multi_agent_query_sync(query: str) -> Dict[str, Any]:
     """
     Run multi-agent query synchronously (for CLI).
 
+    All calls share one event loop, so interactive and batch use don't
+    pay loop setup on every query.
+
     Args:
         query: User query
 
     Returns:
         dict: Result with answer, confidence, sources, primary_source
     """
-    import asyncio
+    return _get_event_loop().run_until_complete(run_multi_agent_query(query))
 
-    # Run async function in sync context
-    try:
-        loop = asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
 
-    result = loop.run_until_complete(run_multi_agent_query(query))
-    return result
+async def stream_multi_agent_query(query: str) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Run multi-agent query and stream the final answer.
+
+    The enabled agents run concurrently (as in the graph), then the supervisor
+    streams its synthesis. The first frame carries the metadata
+    (confidence, sources, primary_source, agent confidences), every following
+    frame is {"delta": text}.
+
+    Args:
+        query: User query
+
+    Yields:
+        dict: Metadata frame, then answer deltas
+    """
+    state = create_initial_state(query)
+
+    agents = []
+    if settings.ENABLE_RAG_AGENT:
+        agents.append(rag_agent)
+    if settings.ENABLE_TEMPORAL_AGENT:
+        agents.append(temporal_agent)
+
+    # Agents run in parallel; each returns a partial update for its own fields
+    updates = await asyncio.gather(*(agent.aexecute(state) for agent in agents))
+    for update in updates:
+        for field_name, value in update.items():
+            setattr(state, field_name, value)
+
+    async for frame in supervisor_agent.astream_answer(state):
+        if "delta" in frame:
+            yield frame
+        else:
+            yield {
+                "confidence": float(frame["confidence_score"]),
+                "sources": frame["citations"],
+                "primary_source": frame["primary_source"],
+                "rag_confidence": float(state.rag_confidence),
+                "temporal_confidence": float(state.temporal_confidence),
+                "rag_source_metadata": state.rag_source_metadata,
+            }
+
+
+def stream_multi_agent_query_sync(query: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream a multi-agent query synchronously (for CLI).
+
+    Args:
+        query: User query
+
+    Yields:
+        dict: Frames from stream_multi_agent_query
+    """
+    loop = _get_event_loop()
+    frames = stream_multi_agent_query(query)
+
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(frames.__anext__())
+            except StopAsyncIteration:
+                break
+    finally:
+        loop.run_until_complete(frames.aclose())
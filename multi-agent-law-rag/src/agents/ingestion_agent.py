@@ -2,6 +2,8 @@
 Document ingestion agent for processing PDFs into vector store.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List
 from tqdm import tqdm
@@ -12,16 +14,33 @@ from ..vectorstore.document_processor import process_pdf_to_chunks
 from ..vectorstore.vector_store import (
     get_or_create_collection,
     add_documents,
-    check_if_document_exists
+    check_if_document_exists,
+    quantize_collection
 )
 
 
+def process_pdf_to_chunks_mp(pdf_path: Path):
+    """
+    Chunk one PDF inside a worker process.
+
+    Returns (documents, error) so a bad file doesn't abort the whole pool.
+    """
+    try:
+        return process_pdf_to_chunks(pdf_path, clean_text=True, extract_metadata=True), None
+    except Exception as e:
+        return None, str(e)
+
+
 class IngestionAgent(BaseAgent):
     """Agent responsible for ingesting PDFs into vector store."""
 
     def __init__(self):
         super().__init__("IngestionAgent")
-        self.vectorstore = None
+
+    @property
+    def vectorstore(self):
+        """Shared process-wide vectorstore (loaded once)."""
+        return get_or_create_collection()
 
     def execute(self, state: Dict) -> Dict:
         """Not used for ingestion - use ingest_all_documents() instead."""
@@ -49,9 +68,6 @@ class IngestionAgent(BaseAgent):
                 "failed": 0,
             }
 
-        # Initialize vectorstore once
-        self.vectorstore = get_or_create_collection()
-
         results = {
             "total_docs": len(pdf_files),
             "success": 0,
@@ -63,22 +79,56 @@ class IngestionAgent(BaseAgent):
 
         print(f"Found {len(pdf_files)} PDF files")
 
-        for pdf_path in tqdm(pdf_files, desc="Ingesting PDFs"):
+        # Stage 1: chunk every PDF in parallel (parsing and cleanup are CPU-bound,
+        # so each PDF gets its own process)
+        to_process = []
+        for pdf_path in pdf_files:
+            if not force and self.check_if_ingested(pdf_path):
+                results["skipped"] += 1
+            else:
+                to_process.append(pdf_path)
+
+        chunked = {}
+
+        if to_process:
+            max_workers = min(os.cpu_count() or 1, len(to_process))
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(process_pdf_to_chunks_mp, pdf_path): pdf_path
+                    for pdf_path in to_process
+                }
+                for future in tqdm(as_completed(futures), total=len(futures), desc="Chunking PDFs"):
+                    chunked[futures[future]] = future.result()
+
+        # Collect in directory order so the index layout is deterministic
+        all_documents = []
+        ingested_files = []
+
+        for pdf_path in to_process:
+            documents, error = chunked[pdf_path]
+            if error is not None:
+                results["failed"] += 1
+                results["failed_files"].append(f"{pdf_path.name}: {error}")
+            elif not documents:
+                results["failed"] += 1
+                results["failed_files"].append(str(pdf_path.name))
+            else:
+                all_documents.extend(documents)
+                ingested_files.append(pdf_path)
+
+        # Stage 2: embed and index all chunks together in the main process, so the
+        # vectorstore has a single writer and embedding requests are packed across files
+        if all_documents:
             try:
-                result = self.ingest_single_document(pdf_path, force=force)
-
-                if result["status"] == "skipped":
-                    results["skipped"] += 1
-                elif result["status"] == "success":
-                    results["success"] += 1
-                    results["total_chunks"] += result["chunks_created"]
-                else:
-                    results["failed"] += 1
-                    results["failed_files"].append(str(pdf_path.name))
-
+                add_documents(all_documents, self.vectorstore)
+                results["success"] += len(ingested_files)
+                results["total_chunks"] += len(all_documents)
             except Exception as e:
-                results["failed"] += 1
-                results["failed_files"].append(f"{pdf_path.name}: {str(e)}")
+                results["failed"] += len(ingested_files)
+                results["failed_files"].extend(f"{p.name}: {str(e)}" for p in ingested_files)
+
+        # Migrate an exact index to the configured index type/quantization (no-op once migrated)
+        quantize_collection(self.vectorstore)
 
         return results
 
@@ -107,9 +157,6 @@ class IngestionAgent(BaseAgent):
         documents = process_pdf_to_chunks(pdf_path, clean_text=True, extract_metadata=True)
 
         # Add to vectorstore
-        if self.vectorstore is None:
-            self.vectorstore = get_or_create_collection()
-
         add_documents(documents, self.vectorstore)
 
         # Extract metadata from first document
@@ -136,18 +183,12 @@ class IngestionAgent(BaseAgent):
         Returns:
             bool: True if already ingested
         """
-        if self.vectorstore is None:
-            self.vectorstore = get_or_create_collection()
-
         return check_if_document_exists(pdf_path.name, self.vectorstore)
 
     def get_ingestion_report(self) -> Dict:
         """Get current ingestion statistics."""
         from ..vectorstore.vector_store import get_collection_stats
 
-        if self.vectorstore is None:
-            self.vectorstore = get_or_create_collection()
-
         return get_collection_stats(self.vectorstore)
 
 
@@ -2,14 +2,54 @@
 RAG agent using hybrid retrieval (semantic + BM25) and LLM generation.
 """
 
-from typing import Dict, List, Any
+import asyncio
+import io
+import logging
+import re
+from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
 from langchain_openai import ChatOpenAI
 from langchain.schema import Document
 
 from .base_agent import BaseAgent
 from .state import MultiAgentState
 from ..config import settings
-from ..vectorstore.vector_store import get_or_create_collection, get_hybrid_retriever
+from ..utils.openai_clients import shared_client_kwargs
+from ..cache.semantic_cache import SemanticCache, content_fingerprint
+from ..vectorstore.embeddings import embed_query_cached
+from ..vectorstore.vector_store import (
+    get_or_create_collection,
+    get_bm25_retriever,
+    get_corpus_version,
+    reciprocal_rank_fusion
+)
+
+logger = logging.getLogger(__name__)
+
+# Phrases the prompt asks the LLM to use when supplementing with general knowledge
+_PRETRAINED_RE = re.compile(
+    r"βάσει γενικών γνώσεων|εκτός φεκ|από γενική γνώση|επιπλέον",
+    re.IGNORECASE
+)
+_RAG_RE = re.compile(r"φεκ", re.IGNORECASE)
+
+# Fixed parts of the answer prompt (only the context and question vary per call)
+_PROMPT_HEADER = """Απάντησε στην ερώτηση βασιζόμενος ΚΥΡΙΩΣ στα ακόλουθα έγγραφα ΦΕΚ.
+
+Έγγραφα:
+"""
+
+_PROMPT_FOOTER = """ΟΔΗΓΙΕΣ:
+1. Χρησιμοποίησε ΠΡΩΤΙΣΤΩΣ τις πληροφορίες από τα παραπάνω έγγραφα ΦΕΚ
+2. Αν τα έγγραφα δεν καλύπτουν πλήρως την ερώτηση, ΜΠΟΡΕΙΣ να συμπληρώσεις με γενικές γνώσεις
+3. Όταν χρησιμοποιείς πληροφορίες από ΦΕΚ, αναφέρε το ΦΕΚ
+4. Όταν χρησιμοποιείς γενικές γνώσεις, ΠΡΕΠΕΙ να το δηλώσεις με φράσεις όπως:
+   - "Βάσει γενικών γνώσεων..."
+   - "Σημειώνεται (εκτός ΦΕΚ) ότι..."
+   - "Επιπλέον (από γενική γνώση)..."
+5. Ξεχώρισε ΣΑΦΩΣ τις πληροφορίες από ΦΕΚ από τις γενικές γνώσεις
+
+Απάντηση:"""
 
 
 class RAGAgent(BaseAgent):
@@ -17,13 +57,25 @@ class RAGAgent(BaseAgent):
 
     def __init__(self):
         super().__init__("RAGAgent")
-        self.vectorstore = None
+        self._bm25_retriever = None
+        self._bm25_retriever_key = None
+        self.answer_cache = SemanticCache(
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES
+        )
         self.llm = ChatOpenAI(
             model=settings.OPENAI_MODEL,
             temperature=settings.LLM_TEMPERATURE,
             max_tokens=settings.LLM_MAX_TOKENS,
+            **shared_client_kwargs(),
         )
 
+    @property
+    def vectorstore(self):
+        """Shared process-wide vectorstore (loaded once)."""
+        return get_or_create_collection()
+
     def execute(self, state: MultiAgentState) -> Dict[str, Any]:
         """
         Execute RAG agent: retrieve documents and generate answer.
@@ -34,42 +86,77 @@ class RAGAgent(BaseAgent):
         Returns:
             Dict: Partial state update with RAG-specific fields only
         """
-        query = state["query"]
-        print(f"\n[RAG AGENT] Executing with query: {query}")
-
-        # Initialize vectorstore if needed
-        if self.vectorstore is None:
-            self.vectorstore = get_or_create_collection()
+        query = state.query
+        logger.debug("[RAG AGENT] Executing with query: %s", query)
 
         # Retrieve relevant documents using hybrid search
-        retrieved_docs = self.retrieve_context(query)
+        retrieved_docs, scores = self.retrieve_context(query)
 
         if not retrieved_docs:
-            # Return only RAG-specific fields
-            return {
-                "rag_response": "No relevant documents found in local database.",
-                "rag_sources": [],
-                "rag_confidence": 0.0
-            }
+            return self._empty_result()
 
         # Generate answer using LLM
         answer = self.generate_answer(query, retrieved_docs)
 
+        return self._build_result(answer, retrieved_docs, scores)
+
+    async def aexecute(self, state: MultiAgentState) -> Dict[str, Any]:
+        """
+        Async RAG execution: the dense and keyword retrieval legs run
+        concurrently in worker threads (the query embedding is a network call,
+        BM25 scoring is CPU-bound), the LLM call is awaited natively.
+
+        Args:
+            state: Current multi-agent state
+
+        Returns:
+            Dict: Partial state update with RAG-specific fields only
+        """
+        query = state.query
+        logger.debug("[RAG AGENT] Executing with query: %s", query)
+
+        # Dense leg (query embedding + FAISS) and keyword leg (BM25) in parallel
+        k = settings.RETRIEVAL_TOP_K
+        dense_hits, keyword_docs = await asyncio.gather(
+            asyncio.to_thread(self._dense_search, query, k),
+            asyncio.to_thread(self._keyword_search, query, k)
+        )
+        retrieved_docs, scores = self._fuse_results(dense_hits, keyword_docs, k)
+
+        if not retrieved_docs:
+            return self._empty_result()
+
+        answer = await self.agenerate_answer(query, retrieved_docs)
+
+        return self._build_result(answer, retrieved_docs, scores)
+
+    def _empty_result(self) -> Dict[str, Any]:
+        """RAG-specific fields when nothing was retrieved."""
+        return {
+            "rag_response": "No relevant documents found in local database.",
+            "rag_sources": [],
+            "rag_scores": np.empty(0, dtype=np.float32),
+            "rag_confidence": 0.0
+        }
+
+    def _build_result(self, answer: str, retrieved_docs: List[Document], scores: np.ndarray) -> Dict[str, Any]:
+        """RAG-specific fields for a generated answer."""
         # Extract source metadata
         source_metadata = self.extract_source_metadata(answer)
 
         # Calculate confidence based on retrieval quality
-        confidence = self.calculate_confidence(retrieved_docs)
+        confidence = self.calculate_confidence(retrieved_docs, scores)
 
         # Return only RAG-specific fields
         return {
             "rag_response": answer,
             "rag_sources": retrieved_docs,
+            "rag_scores": scores,
             "rag_confidence": confidence,
             "rag_source_metadata": source_metadata
         }
 
-    def retrieve_context(self, query: str, k: int = None) -> List[Document]:
+    def retrieve_context(self, query: str, k: int = None) -> Tuple[List[Document], np.ndarray]:
         """
         Retrieve relevant documents using hybrid search (semantic + BM25).
 
@@ -78,33 +165,76 @@ class RAGAgent(BaseAgent):
             k: Number of documents (uses config if None)
 
         Returns:
-            List[Document]: Retrieved documents with similarity scores
+            Tuple[List[Document], np.ndarray]: Retrieved documents and their
+            FAISS L2 distances as a float32 array (NaN for keyword-only hits)
         """
         if k is None:
             k = settings.RETRIEVAL_TOP_K
 
-        # Get all documents for BM25 retriever
-        # Note: For large collections, consider caching or separate BM25 index
-        all_docs = self.vectorstore.similarity_search("", k=1000)
+        return self._fuse_results(self._dense_search(query, k), self._keyword_search(query, k), k)
+
+    def _dense_search(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        """Dense leg: one embedding (cached) and one FAISS query that returns scores."""
+        query_vector = embed_query_cached(query)
+        return self.vectorstore.similarity_search_with_score_by_vector(query_vector, k=k * 4)
+
+    def _keyword_search(self, query: str, k: int) -> Optional[List[Document]]:
+        """
+        Keyword leg: BM25 index is reused until the corpus changes.
 
-        # Create hybrid retriever
-        hybrid_retriever = get_hybrid_retriever(
-            vectorstore=self.vectorstore,
-            documents=all_docs,
-            k=k
+        Returns None when no query token occurs in the corpus - it would add no signal.
+        """
+        bm25_retriever = self._get_bm25_retriever(k)
+        if bm25_retriever is not None and bm25_retriever.has_vocabulary_overlap(query):
+            return bm25_retriever.invoke(query)
+        return None
+
+    def _fuse_results(
+        self,
+        dense_hits: List[Tuple[Document, float]],
+        keyword_docs: Optional[List[Document]],
+        k: int
+    ) -> Tuple[List[Document], np.ndarray]:
+        """Combine both retrieval legs into the top-k documents and their dense scores."""
+        dense_scores = {doc.page_content: score for doc, score in dense_hits}
+
+        if keyword_docs is None:
+            # Dense only
+            docs = [doc for doc, _ in dense_hits][:k]
+        else:
+            # Hybrid ranking via Reciprocal Rank Fusion
+            docs = reciprocal_rank_fusion(
+                [[doc for doc, _ in dense_hits], keyword_docs],
+                [settings.SEMANTIC_WEIGHT, settings.BM25_WEIGHT],
+                k=k
+            )
+
+        # Scores aligned with the fused docs (NaN for BM25-only hits), kept out of
+        # doc.metadata because those Document objects are shared with the docstore
+        scores = np.array(
+            [dense_scores.get(doc.page_content, np.nan) for doc in docs],
+            dtype=np.float32
         )
 
-        # Retrieve documents
-        docs = hybrid_retriever.invoke(query)
+        return docs, scores
+
+    def _get_bm25_retriever(self, k: int):
+        """
+        Get the cached BM25 retriever, rebuilding it only when the corpus changes.
+
+        Args:
+            k: Number of results
 
-        # Also get similarity scores for confidence calculation
-        docs_with_scores = self.vectorstore.similarity_search_with_score(query, k=k)
+        Returns:
+            BM25Retriever: Keyword retriever over the whole docstore
+        """
+        key = (get_corpus_version(), id(self.vectorstore), k)
 
-        # Attach scores to documents for confidence calculation
-        for doc, (scored_doc, score) in zip(docs[:k], docs_with_scores):
-            doc.metadata['similarity_score'] = float(score)
+        if self._bm25_retriever_key != key:
+            self._bm25_retriever = get_bm25_retriever(self.vectorstore, k=k)
+            self._bm25_retriever_key = key
 
-        return docs[:k]  # Ensure we don't exceed k
+        return self._bm25_retriever
 
     def generate_answer(self, query: str, context_docs: List[Document]) -> str:
         """
@@ -117,45 +247,89 @@ class RAGAgent(BaseAgent):
         Returns:
             str: Generated answer
         """
-        # Format context from documents
-        context_parts = []
-        for i, doc in enumerate(context_docs, 1):
-            metadata = doc.metadata
-            source = metadata.get("source", "Unknown")
-            fek_number = metadata.get("fek_number", "N/A")
-            doc_type = metadata.get("doc_type", "N/A")
+        # Reuse a previous answer for a near-identical question over the same documents
+        cache_key = self._answer_cache_key(query, context_docs)
+        if cache_key is not None:
+            cached_answer = self.answer_cache.search(*cache_key)
+            if cached_answer is not None:
+                return cached_answer
 
-            context_parts.append(
-                f"[Έγγραφο {i}] ΦΕΚ: {fek_number}, Τύπος: {doc_type}, Πηγή: {source}\n"
-                f"{doc.page_content[:500]}...\n"
-            )
+        prompt = self.build_prompt(query, context_docs)
 
-        context = "\n\n".join(context_parts)
+        # Generate answer
+        response = self.llm.invoke(prompt)
 
-        # Create prompt
-        prompt = f"""Απάντησε στην ερώτηση βασιζόμενος ΚΥΡΙΩΣ στα ακόλουθα έγγραφα ΦΕΚ.
+        if cache_key is not None:
+            self.answer_cache.add(cache_key[0], response.content, cache_key[1])
 
-Έγγραφα:
-{context}
+        return response.content
 
-Ερώτηση: {query}
+    async def agenerate_answer(self, query: str, context_docs: List[Document]) -> str:
+        """
+        Async version of generate_answer (awaits the LLM instead of blocking).
 
-ΟΔΗΓΙΕΣ:
-1. Χρησιμοποίησε ΠΡΩΤΙΣΤΩΣ τις πληροφορίες από τα παραπάνω έγγραφα ΦΕΚ
-2. Αν τα έγγραφα δεν καλύπτουν πλήρως την ερώτηση, ΜΠΟΡΕΙΣ να συμπληρώσεις με γενικές γνώσεις
-3. Όταν χρησιμοποιείς πληροφορίες από ΦΕΚ, αναφέρε το ΦΕΚ
-4. Όταν χρησιμοποιείς γενικές γνώσεις, ΠΡΕΠΕΙ να το δηλώσεις με φράσεις όπως:
-   - "Βάσει γενικών γνώσεων..."
-   - "Σημειώνεται (εκτός ΦΕΚ) ότι..."
-   - "Επιπλέον (από γενική γνώση)..."
-5. Ξεχώρισε ΣΑΦΩΣ τις πληροφορίες από ΦΕΚ από τις γενικές γνώσεις
+        Args:
+            query: User query
+            context_docs: Retrieved documents
 
-Απάντηση:"""
+        Returns:
+            str: Generated answer
+        """
+        # On an embedding cache miss the key costs an embeddings request; keep it off the loop
+        cache_key = await asyncio.to_thread(self._answer_cache_key, query, context_docs)
+        if cache_key is not None:
+            cached_answer = self.answer_cache.search(*cache_key)
+            if cached_answer is not None:
+                return cached_answer
+
+        prompt = self.build_prompt(query, context_docs)
+        response = await self.ainvoke_llm(prompt)
+
+        if cache_key is not None:
+            self.answer_cache.add(cache_key[0], response.content, cache_key[1])
 
-        # Generate answer
-        response = self.llm.invoke(prompt)
         return response.content
 
+    def _answer_cache_key(self, query: str, context_docs: List[Document]):
+        """
+        Get (query vector, namespace) for the semantic answer cache, or None if disabled.
+
+        The query vector is usually in the embedding cache from retrieval, but a
+        miss makes a blocking embeddings request, so async callers run this in a thread.
+        """
+        if not settings.SEMANTIC_CACHE_ENABLED:
+            return None
+        return embed_query_cached(query), content_fingerprint(context_docs)
+
+    def build_prompt(self, query: str, context_docs: List[Document]) -> str:
+        """
+        Assemble the answer prompt around the constant instruction scaffolding.
+
+        Args:
+            query: User query
+            context_docs: Retrieved documents
+
+        Returns:
+            str: Prompt text
+        """
+        buf = io.StringIO()
+        buf.write(_PROMPT_HEADER)
+
+        # Format context from documents
+        for i, doc in enumerate(context_docs, 1):
+            metadata = doc.metadata
+            if i > 1:
+                buf.write("\n\n")
+            buf.write(
+                f"[Έγγραφο {i}] ΦΕΚ: {metadata.get('fek_number', 'N/A')}, "
+                f"Τύπος: {metadata.get('doc_type', 'N/A')}, Πηγή: {metadata.get('source', 'Unknown')}\n"
+                f"{doc.page_content[:500]}...\n"
+            )
+
+        buf.write(f"\n\nΕρώτηση: {query}\n\n")
+        buf.write(_PROMPT_FOOTER)
+        return buf.getvalue()
+
     def extract_source_metadata(self, response_text: str) -> Dict[str, Any]:
         """
         Extract metadata about information sources from the response.
@@ -163,19 +337,9 @@ class RAGAgent(BaseAgent):
         Returns:
             Dict: Metadata with keys: has_rag_info, has_pretrained_info, source_mix
         """
-        pretrained_indicators = [
-            "βάσει γενικών γνώσεων",
-            "εκτός φεκ",
-            "από γενική γνώση",
-            "επιπλέον"
-        ]
-
-        has_pretrained = any(
-            indicator in response_text.lower()
-            for indicator in pretrained_indicators
-        )
-
-        has_rag = "ΦΕΚ" in response_text or "φεκ" in response_text.lower()
+        # Single case-insensitive pass each, without lowercasing a copy of the response
+        has_pretrained = _PRETRAINED_RE.search(response_text) is not None
+        has_rag = _RAG_RE.search(response_text) is not None
 
         return {
             "has_rag_info": has_rag,
@@ -185,12 +349,13 @@ class RAGAgent(BaseAgent):
             )
         }
 
-    def calculate_confidence(self, docs: List[Document]) -> float:
+    def calculate_confidence(self, docs: List[Document], scores: np.ndarray = None) -> float:
         """
         Calculate confidence based on retrieval quality using similarity scores.
 
         Args:
-            docs: Retrieved documents (with similarity_score in metadata)
+            docs: Retrieved documents
+            scores: FAISS L2 distances for the documents (NaN where unknown)
 
         Returns:
             float: Confidence score (0.0 - 1.0)
@@ -198,30 +363,25 @@ class RAGAgent(BaseAgent):
         if not docs:
             return 0.0
 
-        # Extract similarity scores from metadata
-        scores = []
-        for doc in docs:
-            score = doc.metadata.get('similarity_score')
-            if score is not None:
-                # FAISS L2 distance: lower is better, convert to similarity
-                # Typical range: 0-2, with <0.5 being very similar
-                similarity = max(0.0, 1.0 - (score / 2.0))
-                scores.append(similarity)
-
-        if not scores:
+        # Missing scores (NaN) carry no retrieval signal, so drop them
+        scores = np.asarray(scores if scores is not None else (), dtype=np.float32)
+        scores = scores[~np.isnan(scores)]
+
+        if scores.size == 0:
             # Fallback: count-based confidence
             return min(len(docs) / settings.RETRIEVAL_TOP_K, 1.0)
 
-        # Weighted average: first doc matters most
-        weights = [1.0 / (i + 1) for i in range(len(scores))]  # 1.0, 0.5, 0.33, 0.25, 0.2
-        weighted_sum = sum(s * w for s, w in zip(scores, weights))
-        total_weight = sum(weights)
+        # FAISS L2 distance: lower is better, convert to similarity
+        # Typical range: 0-2, with <0.5 being very similar
+        similarities = np.maximum(0.0, 1.0 - scores / 2.0)
 
-        confidence = weighted_sum / total_weight
+        # Weighted average: first doc matters most (1.0, 0.5, 0.33, 0.25, 0.2)
+        weights = 1.0 / np.arange(1, similarities.size + 1, dtype=np.float32)
+        confidence = float((similarities * weights).sum() / weights.sum())
 
         # Boost if we have multiple good matches
-        if len(scores) >= settings.RETRIEVAL_TOP_K and scores[0] > 0.7:
-            confidence = min(confidence * 1.1, 1.0)
+        boost = (similarities.size >= settings.RETRIEVAL_TOP_K) & (similarities[0] > 0.7)
+        confidence = min(confidence * (1.0 + 0.1 * boost), 1.0)
 
         return round(confidence, 2)
 
@@ -2,8 +2,10 @@
 LangGraph state definitions for multi-agent system.
 """
 
+from dataclasses import dataclass, field
 from typing import TypedDict, Optional, List, Dict
 from datetime import datetime
+import numpy as np
 from langchain.schema import Document
 
 
@@ -16,38 +18,41 @@ class IngestionState(TypedDict):
     error: Optional[str]
 
 
-class MultiAgentState(TypedDict):
+@dataclass(slots=True)
+class MultiAgentState:
     """
     Shared state for multi-agent Q&A workflow.
-    All agents receive this state and update their specific fields.
+    All agents receive this state and return partial updates for their own fields.
+    Slots keep it compact and give typed attribute access (state.query).
     """
     # Input
     query: str  # User's question
 
     # Temporal agent fields
-    extracted_date: Optional[datetime]  # Parsed date from query
-    temporal_filter: Optional[Dict]  # Date range filter
+    extracted_date: Optional[datetime] = None  # Parsed date from query
+    temporal_filter: Optional[Dict] = None  # Date range filter
 
     # RAG agent fields
-    rag_response: str  # Response from RAG agent
-    rag_sources: List[Document]  # Retrieved documents
-    rag_confidence: float  # 0.0 - 1.0
-    rag_source_metadata: Optional[Dict]  # Tracks if response uses RAG, pretrained, or both
+    rag_response: str = ""  # Response from RAG agent
+    rag_sources: List[Document] = field(default_factory=list)  # Retrieved documents
+    rag_scores: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))  # float32 L2 distances aligned with rag_sources
+    rag_confidence: float = 0.0  # 0.0 - 1.0
+    rag_source_metadata: Optional[Dict] = None  # Tracks if response uses RAG, pretrained, or both
 
     # Temporal agent fields
-    temporal_response: str  # Response from Temporal agent
-    temporal_sources: List[Document]  # Date-filtered documents
-    temporal_confidence: float  # 0.0 - 1.0
+    temporal_response: str = ""  # Response from Temporal agent
+    temporal_sources: List[Document] = field(default_factory=list)  # Date-filtered documents
+    temporal_confidence: float = 0.0  # 0.0 - 1.0
 
     # Supervisor agent fields
-    final_answer: str  # Supervisor's synthesized response
-    confidence_score: float  # Weighted confidence
-    primary_source: str  # "local" or "web"
-    citations: List[Dict]  # All sources combined
+    final_answer: str = ""  # Supervisor's synthesized response
+    confidence_score: float = 0.0  # Weighted confidence
+    primary_source: str = ""  # "local" or "web"
+    citations: List[Dict] = field(default_factory=list)  # All sources combined
 
     # Metadata
-    timestamp: datetime  # Query timestamp
-    error: Optional[str]  # Error message if any agent failed
+    timestamp: datetime = field(default_factory=datetime.now)  # Query timestamp
+    error: Optional[str] = None  # Error message if any agent failed
 
 
 def create_initial_state(query: str) -> MultiAgentState:
@@ -60,32 +65,4 @@ def create_initial_state(query: str) -> MultiAgentState:
     Returns:
         MultiAgentState: Initial state
     """
-    return MultiAgentState(
-        # Input
-        query=query,
-
-        # Temporal
-        extracted_date=None,
-        temporal_filter=None,
-
-        # RAG
-        rag_response="",
-        rag_sources=[],
-        rag_confidence=0.0,
-        rag_source_metadata=None,
-
-        # Temporal
-        temporal_response="",
-        temporal_sources=[],
-        temporal_confidence=0.0,
-
-        # Supervisor
-        final_answer="",
-        confidence_score=0.0,
-        primary_source="",
-        citations=[],
-
-        # Metadata
-        timestamp=datetime.now(),
-        error=None,
-    )
+    return MultiAgentState(query=query)
@@ -2,12 +2,43 @@
 Supervisor agent for orchestrating and synthesizing multi-agent responses.
 """
 
-from typing import Dict, List, Any
+import asyncio
+import hashlib
+import logging
+from itertools import chain
+from string import Template
+import numpy as np
+from typing import AsyncIterator, Dict, List, Any
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import HumanMessage, SystemMessage
 
 from .base_agent import BaseAgent
 from .state import MultiAgentState
 from ..config import settings
+from ..utils.openai_clients import shared_client_kwargs
+from ..cache.semantic_cache import SemanticCache
+from ..vectorstore.embeddings import embed_query_cached
+
+logger = logging.getLogger(__name__)
+
+
+# Static synthesis instructions. Sent first (as the system message) so every
+# synthesis request shares the same prefix and OpenAI's prompt cache can reuse it.
+_SYNTHESIS_SYSTEM_PROMPT = """Συνδύασε τις απαντήσεις των agents σε μία ολοκληρωμένη απάντηση που:
+1. Απαντά στην ερώτηση με σαφήνεια
+2. Διατηρεί τις αναφορές σε ΦΕΚ και τις σημειώσεις για γενικές γνώσεις
+3. Διατηρεί τη διάκριση μεταξύ πληροφοριών από ΦΕΚ και γενικών γνώσεων
+4. Είναι συνοπτική αλλά πλήρης"""
+
+
+_SYNTHESIS_HUMAN_TMPL = Template("""Ερώτηση: $query
+
+Απαντήσεις από Agents:
+$local_text
+
+$priority_instruction
+
+Απάντηση:""")
 
 
 class SupervisorAgent(BaseAgent):
@@ -19,6 +50,14 @@ class SupervisorAgent(BaseAgent):
             model=settings.OPENAI_MODEL,
             temperature=0.2,
             max_tokens=settings.LLM_MAX_TOKENS,
+            # Route synthesis requests to the same prompt cache
+            extra_body={"prompt_cache_key": "supervisor-synth-v1"},
+            **shared_client_kwargs(),
+        )
+        self.answer_cache = SemanticCache(
+            threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+            ttl_seconds=settings.SEMANTIC_CACHE_TTL_SECONDS,
+            max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES
         )
 
     def execute(self, state: MultiAgentState) -> Dict[str, Any]:
@@ -31,20 +70,20 @@ class SupervisorAgent(BaseAgent):
         Returns:
             Dict: Partial state update with supervisor-specific fields only
         """
-        query = state["query"]
+        query = state.query
 
-        print(f"\n[SUPERVISOR] Executing")
-        print(f"[SUPERVISOR] RAG confidence: {state.get('rag_confidence', 'N/A')}")
-        print(f"[SUPERVISOR] Temporal confidence: {state.get('temporal_confidence', 'N/A')}")
+        logger.debug("[SUPERVISOR] Executing")
+        logger.debug("[SUPERVISOR] RAG confidence: %s", state.rag_confidence)
+        logger.debug("[SUPERVISOR] Temporal confidence: %s", state.temporal_confidence)
 
         # Display RAG source metadata if available
-        rag_metadata = state.get("rag_source_metadata")
+        rag_metadata = state.rag_source_metadata
         if rag_metadata:
-            print(f"[SUPERVISOR] RAG source mix: {rag_metadata.get('source_mix', 'N/A')}")
+            logger.debug("[SUPERVISOR] RAG source mix: %s", rag_metadata.get("source_mix", "N/A"))
 
         # Collect responses from all agents
         responses = self.combine_responses(state)
-        print(f"[SUPERVISOR] Collected {len(responses)} responses")
+        logger.debug("[SUPERVISOR] Collected %d responses", len(responses))
 
         if not responses:
             # Return only supervisor fields
@@ -61,8 +100,11 @@ class SupervisorAgent(BaseAgent):
         # Check for conflicts (optional - basic implementation)
         # In production, could add conflict detection logic here
 
-        # Synthesize final answer
-        final_answer = self.synthesize_answer(query, responses, primary_source)
+        # Synthesize final answer (a single agent answer needs no synthesis)
+        if len(responses) == 1 and not settings.SYNTHESIZE_SINGLE_RESPONSE:
+            final_answer = responses[0]["response"]
+        else:
+            final_answer = self.synthesize_answer(query, responses, primary_source)
 
         # Format citations
         citations = self.format_citations(state)
@@ -91,20 +133,20 @@ class SupervisorAgent(BaseAgent):
         responses = []
 
         # RAG agent response
-        if state.get("rag_response"):
+        if state.rag_response:
             responses.append({
                 "agent": "RAG",
-                "response": state["rag_response"],
-                "confidence": state.get("rag_confidence", 0.0),
+                "response": state.rag_response,
+                "confidence": state.rag_confidence,
                 "type": "local"
             })
 
         # Temporal agent response
-        if state.get("temporal_response"):
+        if state.temporal_response:
             responses.append({
                 "agent": "Temporal",
-                "response": state["temporal_response"],
-                "confidence": state.get("temporal_confidence", 0.0),
+                "response": state.temporal_response,
+                "confidence": state.temporal_confidence,
                 "type": "local"
             })
 
@@ -112,8 +154,8 @@ class SupervisorAgent(BaseAgent):
 
     def prioritize_local_context(self, state: MultiAgentState) -> str:
         """Determine primary source based on confidence weights."""
-        rag_conf = state.get("rag_confidence", 0.0)
-        temporal_conf = state.get("temporal_confidence", 0.0)
+        rag_conf = state.rag_confidence
+        temporal_conf = state.temporal_confidence
 
         # Determine primary source based on higher confidence
         if rag_conf >= temporal_conf:
@@ -125,6 +167,83 @@ class SupervisorAgent(BaseAgent):
 
     def synthesize_answer(self, query: str, responses: List[Dict], primary_source: str) -> str:
         """Synthesize final answer from all responses using LLM."""
+        prompt, local_text = self._build_synthesis_prompt(query, responses, primary_source)
+
+        # Reuse the synthesis for a near-identical question over the same agent answers
+        cache_key = self._synthesis_cache_key(query, primary_source, local_text)
+        if cache_key is not None:
+            cached_answer = self.answer_cache.search(*cache_key)
+            if cached_answer is not None:
+                return cached_answer
+
+        response = self.llm.invoke(prompt)
+
+        if cache_key is not None:
+            self.answer_cache.add(cache_key[0], response.content, cache_key[1])
+
+        return response.content
+
+    async def astream_answer(self, state: MultiAgentState) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream the final answer.
+
+        Yields a metadata frame first ({"primary_source", "citations",
+        "confidence_score"} - all computed without the LLM), then
+        {"delta": text} frames as the synthesis is generated.
+
+        Args:
+            state: Multi-agent state with all agent responses
+
+        Yields:
+            dict: Metadata frame, then delta frames
+        """
+        responses = self.combine_responses(state)
+
+        if not responses:
+            yield {"primary_source": "none", "citations": [], "confidence_score": 0.0}
+            yield {"delta": "No responses available from agents."}
+            return
+
+        primary_source = self.prioritize_local_context(state)
+        yield {
+            "primary_source": primary_source,
+            "citations": self.format_citations(state),
+            "confidence_score": self.calculate_final_confidence(state),
+        }
+
+        if len(responses) == 1 and not settings.SYNTHESIZE_SINGLE_RESPONSE:
+            yield {"delta": responses[0]["response"]}
+            return
+
+        prompt, local_text = self._build_synthesis_prompt(state.query, responses, primary_source)
+
+        # With the RAG agent off nothing has embedded the query yet, and a miss is a
+        # blocking embeddings request; keep it off the loop mid-stream
+        cache_key = await asyncio.to_thread(
+            self._synthesis_cache_key, state.query, primary_source, local_text
+        )
+        if cache_key is not None:
+            cached_answer = self.answer_cache.search(*cache_key)
+            if cached_answer is not None:
+                yield {"delta": cached_answer}
+                return
+
+        parts = []
+        async for chunk in self.llm.astream(prompt):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield {"delta": chunk.content}
+
+        if cache_key is not None:
+            self.answer_cache.add(cache_key[0], "".join(parts), cache_key[1])
+
+    def _build_synthesis_prompt(self, query: str, responses: List[Dict], primary_source: str):
+        """
+        Build the synthesis prompt.
+
+        Returns:
+            tuple: (prompt messages, formatted agent responses)
+        """
         # All responses are now local (no web separation)
         local_responses = responses
 
@@ -141,23 +260,28 @@ class SupervisorAgent(BaseAgent):
             else "Δώσε προτεραιότητα στο Temporal agent."
         )
 
-        prompt = f"""Ερώτηση: {query}
-
-Απαντήσεις από Agents:
-{local_text}
+        prompt = [
+            SystemMessage(content=_SYNTHESIS_SYSTEM_PROMPT),
+            HumanMessage(content=_SYNTHESIS_HUMAN_TMPL.substitute(
+                query=query,
+                local_text=local_text,
+                priority_instruction=priority_instruction
+            )),
+        ]
 
-{priority_instruction}
+        return prompt, local_text
 
-Συνδύασε τις απαντήσεις σε μία ολοκληρωμένη απάντηση που:
-1. Απαντά στην ερώτηση με σαφήνεια
-2. Διατηρεί τις αναφορές σε ΦΕΚ και τις σημειώσεις για γενικές γνώσεις
-3. Διατηρεί τη διάκριση μεταξύ πληροφοριών από ΦΕΚ και γενικών γνώσεων
-4. Είναι συνοπτική αλλά πλήρης
+    def _synthesis_cache_key(self, query: str, primary_source: str, local_text: str):
+        """
+        Get (query vector, namespace) for the synthesis cache, or None if caching is off.
 
-Απάντηση:"""
+        Only near-deterministic generations (temperature <= 0.2) are cached.
+        """
+        if not settings.SEMANTIC_CACHE_ENABLED or self.llm.temperature > 0.2:
+            return None
 
-        response = self.llm.invoke(prompt)
-        return response.content
+        namespace = hashlib.sha1(f"{primary_source}||{local_text}".encode("utf-8")).hexdigest()
+        return embed_query_cached(query), namespace
 
     def format_citations(self, state: MultiAgentState) -> List[Dict]:
         """
@@ -169,37 +293,31 @@ class SupervisorAgent(BaseAgent):
         Returns:
             List[Dict]: Formatted citations
         """
-        citations = []
-
-        # Local sources (RAG and Temporal)
-        all_local_docs = []
-
-        if state.get("rag_sources"):
-            all_local_docs.extend(state["rag_sources"])
-
-        if state.get("temporal_sources"):
-            all_local_docs.extend(state["temporal_sources"])
-
-        # Deduplicate by source name
-        seen_sources = set()
-        for doc in all_local_docs:
+        # Deduplicate by source name across RAG and Temporal sources (first seen wins)
+        unique_docs = {}
+        for doc in chain(state.rag_sources or (), state.temporal_sources or ()):
             source = doc.metadata.get("source")
-            if source and source not in seen_sources:
-                seen_sources.add(source)
+            if source and source not in unique_docs:
+                unique_docs[source] = doc
 
-                fek_number = doc.metadata.get("fek_number", "N/A")
-                date = doc.metadata.get("publication_date", "N/A")
+        return [
+            self._format_citation(source, doc.metadata)
+            for source, doc in unique_docs.items()
+        ]
 
-                citation = {
-                    "type": "local",
-                    "source": source,
-                    "fek_number": fek_number,
-                    "date": date,
-                    "text": f"ΦΕΚ {fek_number}, Πηγή: {source}, Ημερομηνία: {date}"
-                }
-                citations.append(citation)
+    @staticmethod
+    def _format_citation(source: str, metadata: Dict) -> Dict:
+        """Citation entry for one source document."""
+        fek_number = metadata.get("fek_number", "N/A")
+        date = metadata.get("publication_date", "N/A")
 
-        return citations
+        return {
+            "type": "local",
+            "source": source,
+            "fek_number": fek_number,
+            "date": date,
+            "text": f"ΦΕΚ {fek_number}, Πηγή: {source}, Ημερομηνία: {date}"
+        }
 
     def calculate_final_confidence(self, state: MultiAgentState) -> float:
         """
@@ -217,48 +335,47 @@ class SupervisorAgent(BaseAgent):
         Returns:
             float: Final confidence score (0.0 - 1.0)
         """
-        rag_conf = state.get("rag_confidence", 0.0)
-        temporal_conf = state.get("temporal_confidence", 0.0)
-
-        # Case 1: Only one agent responded
-        if temporal_conf == 0.0 and rag_conf > 0.0:
-            return round(rag_conf, 2)
-        elif rag_conf == 0.0 and temporal_conf > 0.0:
-            return round(temporal_conf, 2)
-        elif rag_conf == 0.0 and temporal_conf == 0.0:
-            return 0.0
-
-        # Case 2: Both agents responded
-        # Use confidence-weighted average (not simple average)
-        # This gives more influence to the more confident agent
-        weights = [rag_conf, temporal_conf]
-        total_weight = sum(weights)
-
-        if total_weight > 0:
-            # Weighted average: higher confidence agents have more influence
-            weighted_avg = (rag_conf * rag_conf + temporal_conf * temporal_conf) / total_weight
-        else:
-            weighted_avg = 0.0
-
-        # Agreement boost: If both agents highly confident (>=0.7), boost final score
-        # This reflects that having two independent sources agree increases reliability
-        if rag_conf >= 0.7 and temporal_conf >= 0.7:
-            agreement_boost = 0.1
-            weighted_avg = min(1.0, weighted_avg + agreement_boost)
-
-        # Disagreement penalty: If confidences differ significantly (>0.5), reduce confidence
-        # Large disagreement suggests uncertainty or conflicting information
-        elif abs(rag_conf - temporal_conf) > 0.5:
-            disagreement_penalty = 0.1
-            weighted_avg = max(0.0, weighted_avg - disagreement_penalty)
-
-        # Multi-source diversity bonus: Having 2 independent agents is inherently valuable
-        # Small boost for having multiple perspectives (even if confidences differ)
-        if rag_conf > 0.3 and temporal_conf > 0.3:
-            diversity_bonus = 0.05
-            weighted_avg = min(1.0, weighted_avg + diversity_bonus)
-
-        return round(max(0.0, min(1.0, weighted_avg)), 2)
+        final = self._final_confidence(
+            np.array([state.rag_confidence]),
+            np.array([state.temporal_confidence])
+        )
+        return round(float(final[0]), 2)
+
+    @staticmethod
+    def calculate_final_confidence_batch(rag_conf: np.ndarray, temporal_conf: np.ndarray) -> np.ndarray:
+        """
+        Vectorized calculate_final_confidence over many (rag, temporal) pairs.
+
+        Args:
+            rag_conf: RAG agent confidences
+            temporal_conf: Temporal agent confidences
+
+        Returns:
+            np.ndarray: Final confidence per pair (0.0 - 1.0, rounded to 2 decimals)
+        """
+        return np.round(SupervisorAgent._final_confidence(rag_conf, temporal_conf), 2)
+
+    @staticmethod
+    def _final_confidence(rag_conf: np.ndarray, temporal_conf: np.ndarray) -> np.ndarray:
+        """Unrounded final confidence (shared by the scalar and batch versions)."""
+        rag_conf = np.asarray(rag_conf, dtype=np.float64)
+        temporal_conf = np.asarray(temporal_conf, dtype=np.float64)
+
+        # Confidence-weighted average: higher confidence agents have more influence
+        total_weight = rag_conf + temporal_conf
+        weighted_avg = (rag_conf * rag_conf + temporal_conf * temporal_conf) / np.where(total_weight > 0, total_weight, 1.0)
+
+        # Agreement boost (both >= 0.7) and disagreement penalty (gap > 0.5) are mutually exclusive
+        agreement = (rag_conf >= 0.7) & (temporal_conf >= 0.7)
+        disagreement = np.abs(rag_conf - temporal_conf) > 0.5
+
+        # Multi-source diversity bonus: two independent perspectives are inherently valuable
+        diversity = (rag_conf > 0.3) & (temporal_conf > 0.3)
+
+        both = np.clip(weighted_avg + 0.1 * agreement - 0.1 * disagreement + 0.05 * diversity, 0.0, 1.0)
+
+        # Only one agent responded: use its confidence as is
+        return np.where(temporal_conf == 0.0, rag_conf, np.where(rag_conf == 0.0, temporal_conf, both))
 
 
 # Global instance
@@ -3,17 +3,164 @@ Temporal agent for date-based filtering and chronological search.
 """
 
 import re
-import json
+import calendar
+import asyncio
+import hashlib
+import heapq
+import logging
+import threading
+from bisect import bisect_right
+from collections import OrderedDict
 from datetime import datetime
+from string import Template
 from typing import Dict, List, Optional, Any
 import dateparser
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import HumanMessage, SystemMessage
 from langchain.schema import Document
 
 from .base_agent import BaseAgent
 from .state import MultiAgentState
 from ..config import settings
-from ..vectorstore.vector_store import get_or_create_collection, similarity_search
+from ..utils.openai_clients import shared_client_kwargs
+from ..utils.json_utils import parse_llm_json
+from ..vectorstore.vector_store import get_or_create_collection, similarity_search_by_date
+
+logger = logging.getLogger(__name__)
+
+
+# Absolute year patterns, most specific first (Greek and English).
+# in_year_simple (bare year) must stay last so "μετά το 2020" is read as "after".
+_DATE_PATTERNS = [
+    ("after", re.compile(r"(?:μετά|μετα)\s+(?:το|από|απο)\s+(\d{4})", re.IGNORECASE)),
+    ("after", re.compile(r"after\s+(\d{4})", re.IGNORECASE)),
+    ("before", re.compile(r"(?:πριν|προ)\s+(?:το|από|απο)\s+(\d{4})", re.IGNORECASE)),
+    ("before", re.compile(r"before\s+(\d{4})", re.IGNORECASE)),
+    ("in_year", re.compile(r"(?:το|στο|τον)\s+(\d{4})", re.IGNORECASE)),
+    ("in_year", re.compile(r"in\s+(\d{4})", re.IGNORECASE)),
+    ("in_year_simple", re.compile(r"\b(\d{4})\b")),  # Year as standalone word
+]
+
+# Greek and English relative date patterns
+_RELATIVE_PATTERNS = [
+    # Last year / πέρσι
+    ("last_year", re.compile(r"\b(πέρσι|περσι|πέρυσι|περυσι)\b", re.IGNORECASE)),
+    ("last_year", re.compile(r"\blast\s+year\b", re.IGNORECASE)),
+    # This year / φέτος
+    ("this_year", re.compile(r"\b(φέτος|φετος)\b", re.IGNORECASE)),
+    ("this_year", re.compile(r"\bthis\s+year\b", re.IGNORECASE)),
+    # Recent / πρόσφατα (last 2 years)
+    ("recent", re.compile(r"\b(πρόσφατ|προσφατ|recent)\w*\b", re.IGNORECASE)),
+    # Last N years
+    ("last_n_years", re.compile(r"(?:τελευταί|τελευται|τελευταια|last)\s+(\d+)\s+(?:χρόνι|χρονι|years?)", re.IGNORECASE)),
+]
+
+# Pattern: between X and Y / από X έως Y
+_RANGE_PATTERNS = [
+    re.compile(r"(?:between|μεταξύ|μεταξυ)\s+(\d{4})\s+(?:and|και|έως|εως)\s+(\d{4})", re.IGNORECASE),
+    re.compile(r"(\d{4})\s*[-–—]\s*(\d{4})"),  # 2020-2023 or 2020–2023
+    re.compile(r"(?:από|απο)\s+(\d{4})\s+(?:έως|εως|μέχρι|μεχρι)\s+(\d{4})", re.IGNORECASE),
+]
+
+# LLM temporal-intent extraction prompt
+_DATE_PROMPT_TMPL = Template("""Extract temporal information from this Greek/English query about laws. Return JSON only.
+
+Current year: $current_year
+
+Query: $query
+
+If there's temporal intent, return:
+{
+    "has_temporal": true,
+    "type": "exact_year" | "year_range" | "recent" | "after" | "before",
+    "start_year": 2020,
+    "end_year": 2023,
+    "description": "brief description"
+}
+
+If NO temporal intent, return: {"has_temporal": false}
+
+Examples:
+"νόμοι το 2024" → {"has_temporal": true, "type": "exact_year", "start_year": 2024, "end_year": 2024, "description": "in 2024"}
+"πρόσφατοι νόμοι" → {"has_temporal": true, "type": "recent", "start_year": $cy_minus_2, "end_year": $current_year, "description": "recent (last 2 years)"}
+"νεότερα νόμια" → {"has_temporal": true, "type": "recent", "start_year": $cy_minus_2, "end_year": $current_year, "description": "newer laws"}
+"παλιοί νόμοι" → {"has_temporal": true, "type": "before", "start_year": 1900, "end_year": $cy_minus_10, "description": "old laws"}
+"μεταξύ 2020 και 2023" → {"has_temporal": true, "type": "year_range", "start_year": 2020, "end_year": 2023, "description": "2020-2023"}
+"νόμοι για φόρους" → {"has_temporal": false}
+
+JSON:""")
+
+# Static summary instructions, sent first so OpenAI's prompt cache can reuse them
+_SUMMARY_SYSTEM_PROMPT = """Ταξινόμησε και περίγραψε χρονολογικά τα ΦΕΚ που σχετίζονται με την ερώτηση.
+
+ΣΗΜΑΝΤΙΚΟ:
+- Χρησιμοποίησε ΜΟΝΟ τα έγγραφα ΦΕΚ που δίνονται
+- ΜΗΝ προσθέσεις πληροφορίες από τη γενική σου γνώση
+- Δώσε μια χρονολογική περίληψη ΜΟΝΟ των εγγράφων που παρουσιάζονται"""
+
+_SUMMARY_HUMAN_TMPL = Template("""Ερώτηση: $query
+Φίλτρο Ημερομηνίας: $operator $year
+
+Έγγραφα:
+$context
+
+Περίληψη:""")
+
+# Documents rendered into the summary prompt
+_SUMMARY_TOP_K = 5
+
+_SUMMARY_CACHE_BODY = {"prompt_cache_key": "temporal-summary-v1"}
+
+# Base confidence by operator precision
+_OPERATOR_BASE_CONFIDENCE = {
+    "in": 1.0,           # Exact year: highest precision
+    "exact_year": 1.0,   # Same as "in"
+    "range": 0.9,        # Date range: very good
+    "year_range": 0.9,   # Same as "range"
+    "recent": 0.75,      # Relative dates: good but fuzzy
+    "after": 0.7,        # Open-ended: moderate precision
+    "before": 0.7,       # Open-ended: moderate precision
+}
+
+# Result-count multiplier: 1 doc -> 0.7, 2-4 -> 0.85, 5-9 -> 0.95, 10+ -> 1.0
+_COUNT_BUCKETS = (2, 5, 10)
+_COUNT_MULTIPLIERS = (0.7, 0.85, 0.95, 1.0)
+
+# Max LLM date extractions kept in memory (temperature 0, so results are stable)
+_DATE_CACHE_SIZE = 4096
+_MISS = object()
+
+# Sort key for documents without a publication_ts
+_UNDATED = float("-inf")
+
+# Cheap check for any temporal signal before running the LLM or the patterns.
+# Must match everything the patterns above and the LLM prompt examples can
+# handle (years, relative dates), so the English cues are word stems: "recently",
+# "newer", "older" and "earlier" must all get through.
+_TEMPORAL_SNIFF_RE = re.compile(
+    r"\d{4}"
+    r"|πέρσι|περσι|πέρυσι|περυσι|φέτος|φετος|πρόσφατ|προσφατ"
+    r"|τελευταί|τελευται|χρόνι|χρονι|δεκαετ"
+    r"|παλι|παλαι|παλαιό|αρχικ|νέ[οαε]|νε[όοω]τερ|σύγχρον|συγχρον|μεταξύ|μεταξυ"
+    r"|\b(recent|late|new|old|earl|modern|current|past|previous|prior|year|decade)\w*"
+    r"|\b(before|after|between|since|until|last)\b",
+    re.IGNORECASE
+)
+
+# Sort-order cues: explicit oldest-first or newest-first indicators, one pass.
+# The earliest cue in the query wins; without any cue results are newest first.
+_SORT_RE = re.compile(
+    r"(?P<oldest>"
+    r"\b(πρώτ|παλ|αρχ)\w*\b"  # πρώτος, παλιός, αρχικός
+    r"|\b(oldest|earliest|first|chronological)\b"
+    r"|\b(χρονολογικ)\w*\b"  # chronologically
+    r")|(?P<newest>"
+    r"\b(τελευταί|νε[όω]τερ|πρόσφατ)\w*\b"  # τελευταίος, νεότερος, πρόσφατος
+    r"|\b(latest|newest|recent|modern)\b"
+    r"|\b(σύγχρον)\w*\b"  # σύγχρονος (modern)
+    r")",
+    re.IGNORECASE
+)
 
 
 class TemporalAgent(BaseAgent):
@@ -28,13 +175,30 @@ class TemporalAgent(BaseAgent):
                                If False, use only pattern matching (faster, cheaper).
         """
         super().__init__("TemporalAgent")
-        self.vectorstore = None
         self.use_llm_extraction = use_llm_extraction
         self.llm = ChatOpenAI(
             model=settings.OPENAI_MODEL,
-            temperature=0,  # Deterministic for date extraction
+            temperature=0,
             max_tokens=300,
+            **shared_client_kwargs(),
         )
+        # Date extraction is a small JSON classification task: cheap model, JSON mode
+        self.extraction_llm = ChatOpenAI(
+            model=settings.OPENAI_EXTRACTION_MODEL,
+            temperature=0,  # Deterministic for date extraction
+            max_tokens=150,
+            model_kwargs={"response_format": {"type": "json_object"}},
+            **shared_client_kwargs(),
+        )
+
+        # LLM date extractions keyed on (current year, normalized query)
+        self._date_cache: "OrderedDict[str, Optional[Dict]]" = OrderedDict()
+        self._date_cache_lock = threading.Lock()
+
+    @property
+    def vectorstore(self):
+        """Shared process-wide vectorstore (loaded once)."""
+        return get_or_create_collection()
 
     def execute(self, state: MultiAgentState) -> Dict[str, Any]:
         """
@@ -46,44 +210,85 @@ class TemporalAgent(BaseAgent):
         Returns:
             Dict: Partial state update with temporal-specific fields only
         """
-        query = state["query"]
-        print(f"\n[TEMPORAL AGENT] Executing with query: {query}")
+        query = state.query
+        logger.debug("[TEMPORAL AGENT] Executing with query: %s", query)
 
         # Extract date from query
         date_info = self.extract_date_from_query(query)
 
         if not date_info:
-            # No date in query - return only temporal fields
-            return {
-                "temporal_response": "",
-                "temporal_sources": [],
-                "temporal_confidence": 0.0,
-                "extracted_date": None,
-                "temporal_filter": None
-            }
+            return self._no_date_result()
+
+        # Filter documents by date and sort chronologically
+        sorted_docs = self._find_documents(query, date_info)
+
+        if not sorted_docs:
+            return self._no_documents_result(date_info)
+
+        # Generate temporal summary
+        answer = self.generate_temporal_summary(query, sorted_docs, date_info)
 
-        # Initialize vectorstore if needed
-        if self.vectorstore is None:
-            self.vectorstore = get_or_create_collection()
+        return self._build_result(answer, sorted_docs, date_info)
 
-        # Filter documents by date
+    async def aexecute(self, state: MultiAgentState) -> Dict[str, Any]:
+        """
+        Async temporal execution: LLM calls are awaited natively, the date-filtered
+        FAISS search runs in a worker thread.
+
+        Args:
+            state: Current multi-agent state
+
+        Returns:
+            Dict: Partial state update with temporal-specific fields only
+        """
+        query = state.query
+        logger.debug("[TEMPORAL AGENT] Executing with query: %s", query)
+
+        date_info = await self.aextract_date_from_query(query)
+
+        if not date_info:
+            return self._no_date_result()
+
+        sorted_docs = await asyncio.to_thread(self._find_documents, query, date_info)
+
+        if not sorted_docs:
+            return self._no_documents_result(date_info)
+
+        answer = await self.agenerate_temporal_summary(query, sorted_docs, date_info)
+
+        return self._build_result(answer, sorted_docs, date_info)
+
+    def _find_documents(self, query: str, date_info: Dict) -> List[Document]:
+        """Filter documents by date and sort them chronologically."""
         filtered_docs = self.filter_by_date(query, date_info)
 
         if not filtered_docs:
-            return {
-                "temporal_response": f"No documents found for date range: {date_info}",
-                "temporal_sources": [],
-                "temporal_confidence": 0.3,
-                "extracted_date": date_info.get("start_date"),
-                "temporal_filter": date_info
-            }
+            return []
 
-        # Sort chronologically
-        sorted_docs = self.chronological_search(query, filtered_docs)
+        return self.chronological_search(query, filtered_docs, top_k=_SUMMARY_TOP_K)
 
-        # Generate temporal summary
-        answer = self.generate_temporal_summary(query, sorted_docs, date_info)
+    def _no_date_result(self) -> Dict[str, Any]:
+        """Temporal fields when the query has no date - return only temporal fields."""
+        return {
+            "temporal_response": "",
+            "temporal_sources": [],
+            "temporal_confidence": 0.0,
+            "extracted_date": None,
+            "temporal_filter": None
+        }
+
+    def _no_documents_result(self, date_info: Dict) -> Dict[str, Any]:
+        """Temporal fields when no documents match the date range."""
+        return {
+            "temporal_response": f"No documents found for date range: {date_info}",
+            "temporal_sources": [],
+            "temporal_confidence": 0.3,
+            "extracted_date": date_info.get("start_date"),
+            "temporal_filter": date_info
+        }
 
+    def _build_result(self, answer: str, sorted_docs: List[Document], date_info: Dict) -> Dict[str, Any]:
+        """Temporal fields for a generated summary."""
         # Calculate confidence
         confidence = self.calculate_confidence(date_info, sorted_docs)
 
@@ -96,100 +301,149 @@ class TemporalAgent(BaseAgent):
             "temporal_filter": date_info
         }
 
-    def extract_date_from_query(self, query: str) -> Optional[Dict]:
+    def extract_date_from_query(self, query: str, now: Optional[datetime] = None) -> Optional[Dict]:
         """
         Extract date information from query using hybrid approach.
 
         Args:
             query: User query
+            now: Reference time for relative dates (defaults to datetime.now())
 
         Returns:
             dict: Date info with keys: {start_date, end_date, operator, description}
                   Returns None if no date found
         """
+        # No temporal signal at all: neither the LLM nor the patterns would find a date
+        if not _TEMPORAL_SNIFF_RE.search(query):
+            return None
+
+        # One clock reading shared by the LLM prompt, cache key and patterns
+        now = now or datetime.now()
+
         # Strategy 1: LLM extraction (flexible - catches variations)
         if self.use_llm_extraction:
-            llm_result = self._extract_date_with_llm(query)
+            llm_result = self._extract_date_with_llm(query, now)
             if llm_result:
                 return llm_result
 
         # Strategy 2: Pattern-based extraction (fast, reliable fallback)
-        return self._extract_date_with_patterns(query)
+        return self._extract_date_with_patterns(query, now)
+
+    async def aextract_date_from_query(self, query: str, now: Optional[datetime] = None) -> Optional[Dict]:
+        """Async version of extract_date_from_query (awaits the LLM extraction)."""
+        if not _TEMPORAL_SNIFF_RE.search(query):
+            return None
+
+        now = now or datetime.now()
+
+        if self.use_llm_extraction:
+            llm_result = await self._aextract_date_with_llm(query, now)
+            if llm_result:
+                return llm_result
+
+        return self._extract_date_with_patterns(query, now)
 
-    def _extract_date_with_llm(self, query: str) -> Optional[Dict]:
+    def _extract_date_with_llm(self, query: str, now: datetime) -> Optional[Dict]:
         """
         Use LLM to extract temporal intent - catches variations like 'νεότερα', 'σύγχρονοι'.
 
         This is flexible and understands intent, not just keywords.
         """
-        now = datetime.now()
-        current_year = now.year
+        key = self._date_cache_key(query, now)
+        cached = self._get_cached_date(key)
+        if cached is not _MISS:
+            return cached
 
-        prompt = f"""Extract temporal information from this Greek/English query about laws. Return JSON only.
+        try:
+            response = self.extraction_llm.invoke(self._build_date_prompt(query, now))
+            date_info = self._parse_date_response(response.content)
+        except Exception as e:
+            # LLM extraction failed, will fall back to patterns
+            logger.warning("[TEMPORAL] LLM extraction failed: %s, falling back to patterns", e)
+            return None
 
-Current year: {current_year}
+        self._cache_date(key, date_info)
+        return date_info
 
-Query: {query}
+    async def _aextract_date_with_llm(self, query: str, now: datetime) -> Optional[Dict]:
+        """Async version of _extract_date_with_llm."""
+        key = self._date_cache_key(query, now)
+        cached = self._get_cached_date(key)
+        if cached is not _MISS:
+            return cached
 
-If there's temporal intent, return:
-{{
-    "has_temporal": true,
-    "type": "exact_year" | "year_range" | "recent" | "after" | "before",
-    "start_year": 2020,
-    "end_year": 2023,
-    "description": "brief description"
-}}
+        try:
+            response = await self.ainvoke_llm(self._build_date_prompt(query, now), llm=self.extraction_llm)
+            date_info = self._parse_date_response(response.content)
+        except Exception as e:
+            logger.warning("[TEMPORAL] LLM extraction failed: %s, falling back to patterns", e)
+            return None
+
+        self._cache_date(key, date_info)
+        return date_info
+
+    @staticmethod
+    def _date_cache_key(query: str, now: datetime) -> str:
+        """Cache key for an LLM date extraction (the prompt depends only on these)."""
+        return hashlib.sha1(f"{now.year}|{query.strip().lower()}".encode("utf-8")).hexdigest()
+
+    def _get_cached_date(self, key: str):
+        """Cached extraction for key (a copy), or _MISS."""
+        with self._date_cache_lock:
+            if key not in self._date_cache:
+                return _MISS
+            self._date_cache.move_to_end(key)
+            date_info = self._date_cache[key]
+        return dict(date_info) if date_info else None
+
+    def _cache_date(self, key: str, date_info: Optional[Dict]):
+        """Remember a successful extraction (including 'no temporal intent')."""
+        with self._date_cache_lock:
+            self._date_cache[key] = dict(date_info) if date_info else None
+            while len(self._date_cache) > _DATE_CACHE_SIZE:
+                self._date_cache.popitem(last=False)
+
+    def _build_date_prompt(self, query: str, now: datetime) -> str:
+        """Build the LLM prompt for temporal intent extraction."""
+        current_year = now.year
 
-If NO temporal intent, return: {{"has_temporal": false}}
+        return _DATE_PROMPT_TMPL.substitute(
+            query=query,
+            current_year=current_year,
+            cy_minus_2=current_year - 2,
+            cy_minus_10=current_year - 10
+        )
 
-Examples:
-"νόμοι το 2024" → {{"has_temporal": true, "type": "exact_year", "start_year": 2024, "end_year": 2024, "description": "in 2024"}}
-"πρόσφατοι νόμοι" → {{"has_temporal": true, "type": "recent", "start_year": {current_year - 2}, "end_year": {current_year}, "description": "recent (last 2 years)"}}
-"νεότερα νόμια" → {{"has_temporal": true, "type": "recent", "start_year": {current_year - 2}, "end_year": {current_year}, "description": "newer laws"}}
-"παλιοί νόμοι" → {{"has_temporal": true, "type": "before", "start_year": 1900, "end_year": {current_year - 10}, "description": "old laws"}}
-"μεταξύ 2020 και 2023" → {{"has_temporal": true, "type": "year_range", "start_year": 2020, "end_year": 2023, "description": "2020-2023"}}
-"νόμοι για φόρους" → {{"has_temporal": false}}
+    def _parse_date_response(self, content: str) -> Optional[Dict]:
+        """
+        Parse the LLM's JSON answer into date info (None if no valid temporal intent).
 
-JSON:"""
+        Raises:
+            ValueError/KeyError: If the response is not the expected JSON
+        """
+        result = parse_llm_json(content)
 
-        try:
-            response = self.llm.invoke(prompt)
-            content = response.content.strip()
-
-            # Handle markdown code blocks
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-                content = content.strip()
-
-            result = json.loads(content)
-
-            if result.get("has_temporal"):
-                start_year = result["start_year"]
-                end_year = result["end_year"]
-
-                # Validate years
-                if not (1900 <= start_year <= 2100 and 1900 <= end_year <= 2100):
-                    return None
-
-                return {
-                    "start_date": datetime(start_year, 1, 1),
-                    "end_date": datetime(end_year, 12, 31),
-                    "operator": result["type"],
-                    "description": result.get("description", "")
-                }
-        except Exception as e:
-            # LLM extraction failed, will fall back to patterns
-            print(f"[TEMPORAL] LLM extraction failed: {e}, falling back to patterns")
-            pass
+        if result.get("has_temporal"):
+            start_year = result["start_year"]
+            end_year = result["end_year"]
+
+            # Validate years
+            if not (1900 <= start_year <= 2100 and 1900 <= end_year <= 2100):
+                return None
+
+            return {
+                "start_date": datetime(start_year, 1, 1),
+                "end_date": datetime(end_year, 12, 31),
+                "operator": result["type"],
+                "description": result.get("description", "")
+            }
 
         return None
 
-    def _extract_date_with_patterns(self, query: str) -> Optional[Dict]:
+    def _extract_date_with_patterns(self, query: str, now: datetime) -> Optional[Dict]:
         """Pattern-based date extraction - fast and reliable."""
         # Strategy 1: Check for relative dates first (highest priority)
-        relative_result = self._extract_relative_dates(query)
+        relative_result = self._extract_relative_dates(query, now)
         if relative_result:
             return relative_result
 
@@ -198,25 +452,9 @@ JSON:"""
         if range_result:
             return range_result
 
-        # Strategy 3: Greek date patterns
-        greek_patterns = {
-            "after": r"(?:μετά|μετα)\s+(?:το|από|απο)\s+(\d{4})",
-            "before": r"(?:πριν|προ)\s+(?:το|από|απο)\s+(\d{4})",
-            "in_year": r"(?:το|στο|τον)\s+(\d{4})",
-            "in_year_simple": r"\b(\d{4})\b",  # Year as standalone word
-        }
-
-        # Strategy 4: English patterns
-        english_patterns = {
-            "after": r"after\s+(\d{4})",
-            "before": r"before\s+(\d{4})",
-            "in_year": r"in\s+(\d{4})",
-        }
-
-        all_patterns = {**greek_patterns, **english_patterns}
-
-        for pattern_type, pattern in all_patterns.items():
-            match = re.search(pattern, query, re.IGNORECASE)
+        # Strategy 3: Absolute year patterns (Greek and English)
+        for pattern_type, pattern in _DATE_PATTERNS:
+            match = pattern.search(query)
             if match:
                 try:
                     year = int(match.group(1))
@@ -228,7 +466,7 @@ JSON:"""
                     if pattern_type == "after":
                         return {
                             "start_date": datetime(year, 1, 1),
-                            "end_date": datetime.now(),
+                            "end_date": now,
                             "operator": "after",
                             "description": f"after {year}"
                         }
@@ -251,71 +489,50 @@ JSON:"""
 
         return None
 
-    def _extract_relative_dates(self, query: str) -> Optional[Dict]:
+    def _extract_relative_dates(self, query: str, now: datetime) -> Optional[Dict]:
         """Extract relative date expressions like 'last year', 'recently', etc."""
-        now = datetime.now()
         current_year = now.year
 
-        # Greek and English relative date patterns
-        relative_patterns = {
-            # Last year / πέρσι
-            "last_year": [r"\b(πέρσι|περσι|πέρυσι|περυσι)\b", r"\blast\s+year\b"],
-            # This year / φέτος
-            "this_year": [r"\b(φέτος|φετος)\b", r"\bthis\s+year\b"],
-            # Recent / πρόσφατα (last 2 years)
-            "recent": [r"\b(πρόσφατ|προσφατ|recent)\w*\b"],
-            # Last N years
-            "last_n_years": [r"(?:τελευταί|τελευται|τελευταια|last)\s+(\d+)\s+(?:χρόνι|χρονι|years?)"],
-        }
-
-        for pattern_type, patterns in relative_patterns.items():
-            for pattern in patterns:
-                match = re.search(pattern, query, re.IGNORECASE)
-                if match:
-                    if pattern_type == "last_year":
-                        return {
-                            "start_date": datetime(current_year - 1, 1, 1),
-                            "end_date": datetime(current_year - 1, 12, 31),
-                            "operator": "in",
-                            "description": f"last year ({current_year - 1})"
-                        }
-                    elif pattern_type == "this_year":
-                        return {
-                            "start_date": datetime(current_year, 1, 1),
-                            "end_date": now,
-                            "operator": "in",
-                            "description": f"this year ({current_year})"
-                        }
-                    elif pattern_type == "recent":
-                        # Last 2 years
-                        return {
-                            "start_date": datetime(current_year - 2, 1, 1),
-                            "end_date": now,
-                            "operator": "recent",
-                            "description": "recent (last 2 years)"
-                        }
-                    elif pattern_type == "last_n_years":
-                        n = int(match.group(1))
-                        return {
-                            "start_date": datetime(current_year - n, 1, 1),
-                            "end_date": now,
-                            "operator": "recent",
-                            "description": f"last {n} years"
-                        }
+        for pattern_type, pattern in _RELATIVE_PATTERNS:
+            match = pattern.search(query)
+            if match:
+                if pattern_type == "last_year":
+                    return {
+                        "start_date": datetime(current_year - 1, 1, 1),
+                        "end_date": datetime(current_year - 1, 12, 31),
+                        "operator": "in",
+                        "description": f"last year ({current_year - 1})"
+                    }
+                elif pattern_type == "this_year":
+                    return {
+                        "start_date": datetime(current_year, 1, 1),
+                        "end_date": now,
+                        "operator": "in",
+                        "description": f"this year ({current_year})"
+                    }
+                elif pattern_type == "recent":
+                    # Last 2 years
+                    return {
+                        "start_date": datetime(current_year - 2, 1, 1),
+                        "end_date": now,
+                        "operator": "recent",
+                        "description": "recent (last 2 years)"
+                    }
+                elif pattern_type == "last_n_years":
+                    n = int(match.group(1))
+                    return {
+                        "start_date": datetime(current_year - n, 1, 1),
+                        "end_date": now,
+                        "operator": "recent",
+                        "description": f"last {n} years"
+                    }
 
         return None
 
     def _extract_date_range(self, query: str) -> Optional[Dict]:
         """Extract date ranges like 'between 2020 and 2023' or '2020-2023'."""
-        # Pattern: between X and Y / από X έως Y
-        range_patterns = [
-            r"(?:between|μεταξύ|μεταξυ)\s+(\d{4})\s+(?:and|και|έως|εως)\s+(\d{4})",
-            r"(\d{4})\s*[-–—]\s*(\d{4})",  # 2020-2023 or 2020–2023
-            r"(?:από|απο)\s+(\d{4})\s+(?:έως|εως|μέχρι|μεχρι)\s+(\d{4})",
-        ]
-
-        for pattern in range_patterns:
-            match = re.search(pattern, query, re.IGNORECASE)
+        for pattern in _RANGE_PATTERNS:
+            match = pattern.search(query)
             if match:
                 try:
                     year1 = int(match.group(1))
@@ -349,37 +566,26 @@ JSON:"""
         Returns:
             List[Document]: Filtered documents
         """
-        # Create date filter for FAISS metadata filtering
-        start_date_str = date_info["start_date"].isoformat()
-        end_date_str = date_info["end_date"].isoformat()
-
-        # Metadata filter (FAISS applies post-retrieval)
-        filters = {
-            "publication_date": {
-                "$gte": start_date_str,
-                "$lte": end_date_str
-            }
-        }
-
-        # Search with date filter
-        # Need to search through many more documents when filtering by date
-        # since temporal filtering drastically reduces the result set
-        docs = similarity_search(
+        # Restrict the index search to the date range (publication_ts, unix seconds)
+        docs = similarity_search_by_date(
             query,
+            start_ts=calendar.timegm(date_info["start_date"].timetuple()),
+            end_ts=calendar.timegm(date_info["end_date"].timetuple()),
             vectorstore=self.vectorstore,
-            k=500,  # Search through more documents to find date matches
-            filters=filters
+            k=20
         )
 
         return docs
 
-    def chronological_search(self, query: str, documents: List[Document]) -> List[Document]:
+    def chronological_search(self, query: str, documents: List[Document], top_k: Optional[int] = None) -> List[Document]:
         """
         Sort documents chronologically based on query intent.
 
         Args:
             query: User query
             documents: Documents to sort
+            top_k: Only order the first top_k documents chronologically; the
+                   rest follow in their original (relevance) order
 
         Returns:
             List[Document]: Sorted documents
@@ -387,23 +593,19 @@ JSON:"""
         # Detect sort preference from query
         sort_order = self._detect_sort_preference(query)
 
-        # Sort by publication date
-        def get_date(doc):
-            date_str = doc.metadata.get("publication_date")
-            if date_str:
-                try:
-                    return datetime.fromisoformat(date_str)
-                except:
-                    return datetime.min
-            return datetime.min
+        # Sort on the integer publication timestamp; undated documents sort as oldest
+        timestamps = [doc.metadata.get("publication_ts", _UNDATED) for doc in documents]
+
+        if top_k is None or top_k >= len(documents):
+            order = sorted(range(len(documents)), key=timestamps.__getitem__, reverse=(sort_order != "oldest"))
+            return [documents[i] for i in order]
 
-        # Apply sort order
-        if sort_order == "oldest":
-            sorted_docs = sorted(documents, key=get_date, reverse=False)
-        else:  # newest (default)
-            sorted_docs = sorted(documents, key=get_date, reverse=True)
+        # Partial sort: O(n log k) selection of the documents that will be rendered
+        select = heapq.nsmallest if sort_order == "oldest" else heapq.nlargest
+        head = select(top_k, range(len(documents)), key=timestamps.__getitem__)
+        head_set = set(head)
 
-        return sorted_docs
+        return [documents[i] for i in head] + [doc for i, doc in enumerate(documents) if i not in head_set]
 
     def _detect_sort_preference(self, query: str) -> str:
         """
@@ -415,30 +617,8 @@ JSON:"""
         Returns:
             str: "oldest" for ascending, "newest" for descending
         """
-        # Explicit oldest-first indicators
-        oldest_patterns = [
-            r"\b(πρώτ|παλ|αρχ)\w*\b",  # πρώτος, παλιός, αρχικός
-            r"\b(oldest|earliest|first|chronological)\b",
-            r"\b(χρονολογικ)\w*\b",  # chronologically
-        ]
-
-        # Explicit newest-first indicators
-        newest_patterns = [
-            r"\b(τελευταί|νε[όω]τερ|πρόσφατ)\w*\b",  # τελευταίος, νεότερος, πρόσφατος
-            r"\b(latest|newest|recent|modern)\b",
-            r"\b(σύγχρον)\w*\b",  # σύγχρονος (modern)
-        ]
-
-        for pattern in oldest_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
-                return "oldest"
-
-        for pattern in newest_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
-                return "newest"
-
-        # Default: newest first (most common for legal queries)
-        return "newest"
+        match = _SORT_RE.search(query)
+        return "oldest" if match and match.group("oldest") else "newest"
 
     def generate_temporal_summary(self, query: str, documents: List[Document], date_info: Dict) -> str:
         """
@@ -455,9 +635,28 @@ JSON:"""
         if not documents:
             return "No documents found for the specified date range."
 
+        response = self.llm.invoke(
+            self._build_summary_prompt(query, documents, date_info),
+            extra_body=_SUMMARY_CACHE_BODY
+        )
+        return response.content
+
+    async def agenerate_temporal_summary(self, query: str, documents: List[Document], date_info: Dict) -> str:
+        """Async version of generate_temporal_summary."""
+        if not documents:
+            return "No documents found for the specified date range."
+
+        response = await self.ainvoke_llm(
+            self._build_summary_prompt(query, documents, date_info),
+            extra_body=_SUMMARY_CACHE_BODY
+        )
+        return response.content
+
+    def _build_summary_prompt(self, query: str, documents: List[Document], date_info: Dict) -> list:
+        """Build the chronological summary messages from the top documents."""
         # Format documents with dates
         doc_summaries = []
-        for i, doc in enumerate(documents[:5], 1):  # Top 5
+        for i, doc in enumerate(documents[:_SUMMARY_TOP_K], 1):
             metadata = doc.metadata
             date = metadata.get("publication_date", "N/A")
             fek_number = metadata.get("fek_number", "N/A")
@@ -470,23 +669,17 @@ JSON:"""
 
         context = "\n\n".join(doc_summaries)
 
-        prompt = f"""Ταξινόμησε και περίγραψε χρονολογικά τα ακόλουθα ΦΕΚ που σχετίζονται με την ερώτηση.
-
-Ερώτηση: {query}
-Φίλτρο Ημερομηνίας: {date_info.get('operator')} {date_info.get('start_date').year}
-
-Έγγραφα:
-{context}
-
-ΣΗΜΑΝΤΙΚΟ:
-- Χρησιμοποίησε ΜΟΝΟ τα παραπάνω έγγραφα ΦΕΚ
-- ΜΗΝ προσθέσεις πληροφορίες από τη γενική σου γνώση
-- Δώσε μια χρονολογική περίληψη ΜΟΝΟ των εγγράφων που παρουσιάζονται
-
-Περίληψη:"""
+        prompt = [
+            SystemMessage(content=_SUMMARY_SYSTEM_PROMPT),
+            HumanMessage(content=_SUMMARY_HUMAN_TMPL.substitute(
+                query=query,
+                operator=date_info.get("operator"),
+                year=date_info.get("start_date").year,
+                context=context
+            )),
+        ]
 
-        response = self.llm.invoke(prompt)
-        return response.content
+        return prompt
 
     def calculate_confidence(self, date_info: Dict, docs: List[Document]) -> float:
         """
@@ -502,35 +695,9 @@ JSON:"""
         if not docs:
             return 0.0
 
-        operator = date_info.get("operator", "in")
-        num_docs = len(docs)
-
-        # Base confidence by operator precision
-        base_confidence = {
-            "in": 1.0,           # Exact year: highest precision
-            "exact_year": 1.0,   # Same as "in"
-            "range": 0.9,        # Date range: very good
-            "year_range": 0.9,   # Same as "range"
-            "recent": 0.75,      # Relative dates: good but fuzzy
-            "after": 0.7,        # Open-ended: moderate precision
-            "before": 0.7,       # Open-ended: moderate precision
-        }.get(operator, 0.5)
-
-        # Adjust based on result count
-        if num_docs == 0:
-            return 0.0
-        elif num_docs >= 10:
-            # Many results: high confidence in temporal filtering
-            count_multiplier = 1.0
-        elif num_docs >= 5:
-            # Decent results
-            count_multiplier = 0.95
-        elif num_docs >= 2:
-            # Few results: slightly lower confidence
-            count_multiplier = 0.85
-        else:
-            # Only 1 result: lower confidence
-            count_multiplier = 0.7
+        # Base confidence by operator precision, scaled by result count
+        base_confidence = _OPERATOR_BASE_CONFIDENCE.get(date_info.get("operator", "in"), 0.5)
+        count_multiplier = _COUNT_MULTIPLIERS[bisect_right(_COUNT_BUCKETS, len(docs))]
 
         final_confidence = base_confidence * count_multiplier
         return round(min(final_confidence, 1.0), 2)
@@ -0,0 +1,120 @@
+"""
+In-memory semantic cache for LLM answers.
+
+Answers are stored against the query embedding and looked up by cosine
+similarity (FAISS inner product over normalized vectors). Entries live in a
+namespace - typically a hash of the source documents used to produce the
+answer - so re-ingestion that changes the retrieved context never serves a
+stale answer.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import faiss
+import numpy as np
+from langchain.schema import Document
+
+
+def content_fingerprint(docs: Iterable[Document]) -> str:
+    """Hash document contents (in order) into a cache namespace."""
+    digest = hashlib.sha256()
+    for doc in docs:
+        digest.update(doc.page_content.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class SemanticCache:
+    """FAISS-backed cache of answers keyed by query embedding similarity."""
+
+    def __init__(self, threshold: float = 0.95, ttl_seconds: int = 3600, max_entries: int = 1000):
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._indexes: Dict[str, faiss.IndexIDMap] = {}
+        # id -> (namespace, answer, expires_at), oldest first
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        vec = np.asarray(vector, dtype=np.float32).reshape(1, -1)
+        faiss.normalize_L2(vec)
+        return vec
+
+    def search(self, vector: List[float], namespace: str = "") -> Optional[str]:
+        """
+        Return the cached answer for the most similar query, if above threshold.
+
+        Args:
+            vector: Query embedding
+            namespace: Cache namespace (e.g. content_fingerprint of the context)
+
+        Returns:
+            str: Cached answer, or None on miss
+        """
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None or index.ntotal == 0:
+                return None
+
+            similarities, ids = index.search(self._normalize(vector), 1)
+            entry_id = int(ids[0][0])
+            if entry_id < 0 or similarities[0][0] < self.threshold:
+                return None
+
+            _, answer, expires_at = self._entries[entry_id]
+            if expires_at < time.monotonic():
+                self._remove(entry_id)
+                return None
+
+            self._entries.move_to_end(entry_id)
+            return answer
+
+    def add(self, vector: List[float], answer: str, namespace: str = ""):
+        """
+        Store an answer for a query embedding.
+
+        Args:
+            vector: Query embedding
+            answer: Answer to cache
+            namespace: Cache namespace (e.g. content_fingerprint of the context)
+        """
+        vec = self._normalize(vector)
+
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                index = faiss.IndexIDMap(faiss.IndexFlatIP(vec.shape[1]))
+                self._indexes[namespace] = index
+
+            entry_id = self._next_id
+            self._next_id += 1
+            index.add_with_ids(vec, np.array([entry_id], dtype=np.int64))
+            self._entries[entry_id] = (namespace, answer, time.monotonic() + self.ttl_seconds)
+
+            # Evict least recently used entries
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        """Drop all cached answers."""
+        with self._lock:
+            self._indexes.clear()
+            self._entries.clear()
+
+    def _remove(self, entry_id: int):
+        """Remove one entry (caller holds the lock)."""
+        namespace, _, _ = self._entries.pop(entry_id)
+        index = self._indexes[namespace]
+        index.remove_ids(np.array([entry_id], dtype=np.int64))
+        if index.ntotal == 0:
+            del self._indexes[namespace]
+
+    def __len__(self) -> int:
+        return len(self._entries)
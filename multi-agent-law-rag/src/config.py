@@ -23,6 +23,7 @@ class Settings(BaseSettings):
     OPENAI_API_KEY: str = Field(..., env="OPENAI_API_KEY")
     OPENAI_MODEL: str = Field(default="gpt-4-turbo-preview", env="OPENAI_MODEL")
     OPENAI_EMBEDDING_MODEL: str = Field(default="text-embedding-3-small", env="OPENAI_EMBEDDING_MODEL")
+    OPENAI_EXTRACTION_MODEL: str = Field(default="gpt-4o-mini", env="OPENAI_EXTRACTION_MODEL")
 
     # Application Configuration
     APP_NAME: str = Field(default="Greek Legal Document RAG", env="APP_NAME")
@@ -37,12 +38,18 @@ class Settings(BaseSettings):
     # Vector Store Configuration
     VECTORSTORE_NAME: str = Field(default="greek_legal_docs", env="VECTORSTORE_NAME")
     VECTORSTORE_PERSIST_DIRECTORY: str = Field(default="vectorstore", env="VECTORSTORE_PERSIST_DIRECTORY")
+    FAISS_QUANTIZATION: str = Field(default="none", env="FAISS_QUANTIZATION")  # "none" or "sq8"
+    FAISS_INDEX_TYPE: str = Field(default="flat", env="FAISS_INDEX_TYPE")  # "flat" or "hnsw"
+    FAISS_HNSW_M: int = Field(default=32, env="FAISS_HNSW_M")
+    FAISS_HNSW_EF_SEARCH: int = Field(default=64, env="FAISS_HNSW_EF_SEARCH")
 
     # Document Processing
     CHUNK_SIZE: int = Field(default=1000, env="CHUNK_SIZE")
     CHUNK_OVERLAP: int = Field(default=200, env="CHUNK_OVERLAP")
     MAX_CHUNKS_PER_PDF: int = Field(default=1000, env="MAX_CHUNKS_PER_PDF")
     MAX_TOKENS_PER_EMBEDDING_BATCH: int = Field(default=250000, env="MAX_TOKENS_PER_EMBEDDING_BATCH")
+    MAX_CHUNKS_PER_EMBEDDING_BATCH: int = Field(default=2048, env="MAX_CHUNKS_PER_EMBEDDING_BATCH")
+    EMBEDDING_CONCURRENCY: int = Field(default=8, env="EMBEDDING_CONCURRENCY")
 
     # Retrieval Configuration
     RETRIEVAL_TOP_K: int = Field(default=5, env="RETRIEVAL_TOP_K")
@@ -59,11 +66,19 @@ class Settings(BaseSettings):
     # Parallel Execution
     MAX_CONCURRENT_AGENTS: int = Field(default=3, env="MAX_CONCURRENT_AGENTS")
     AGENT_TIMEOUT_SECONDS: int = Field(default=30, env="AGENT_TIMEOUT_SECONDS")
+    MAX_CONCURRENT_LLM_CALLS: int = Field(default=5, env="MAX_CONCURRENT_LLM_CALLS")
+    SYNTHESIZE_SINGLE_RESPONSE: bool = Field(default=False, env="SYNTHESIZE_SINGLE_RESPONSE")
 
     # LLM Configuration
     LLM_TEMPERATURE: float = Field(default=0.1, env="LLM_TEMPERATURE")
     LLM_MAX_TOKENS: int = Field(default=2000, env="LLM_MAX_TOKENS")
 
+    # Semantic Answer Cache
+    SEMANTIC_CACHE_ENABLED: bool = Field(default=True, env="SEMANTIC_CACHE_ENABLED")
+    SEMANTIC_CACHE_THRESHOLD: float = Field(default=0.95, env="SEMANTIC_CACHE_THRESHOLD")
+    SEMANTIC_CACHE_TTL_SECONDS: int = Field(default=3600, env="SEMANTIC_CACHE_TTL_SECONDS")
+    SEMANTIC_CACHE_MAX_ENTRIES: int = Field(default=1000, env="SEMANTIC_CACHE_MAX_ENTRIES")
+
     # Language Settings
     DEFAULT_LANGUAGE: str = Field(default="el", env="DEFAULT_LANGUAGE")
     ENCODING: str = Field(default="utf-8", env="ENCODING")
@@ -75,6 +90,9 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
         case_sensitive = True
+        # Settings are read once at startup; modules snapshot some of them at
+        # import (text splitter, retry policies), so they must not change later
+        frozen = True
 
 
 # Global settings instance
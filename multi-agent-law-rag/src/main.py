@@ -2,6 +2,11 @@
 CLI interface for Greek Legal Document RAG system.
 """
 
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
 import click
 from rich.console import Console
 from rich.table import Table
@@ -9,10 +14,9 @@ from rich.panel import Panel
 from rich.progress import track
 from pathlib import Path
 
-from .agents.ingestion_agent import ingestion_agent
-from .agents.graph import run_multi_agent_query_sync
-from .vectorstore.vector_store import get_collection_stats, delete_collection
-from .config import get_documents_path
+# Agents and the vector store pull in LangChain, OpenAI and FAISS, so commands
+# import them on demand to keep config-info and friends fast to start
+from .config import settings, get_documents_path
 
 console = Console()
 
@@ -20,7 +24,8 @@ console = Console()
 @click.group()
 def cli():
     """Greek Legal Document RAG System - Multi-Agent CLI"""
-    pass
+    # Agent traces are logged at DEBUG; set LOG_LEVEL=DEBUG to see them
+    logging.basicConfig(level=settings.LOG_LEVEL.upper(), format="%(message)s")
 
 
 @cli.command()
@@ -28,6 +33,8 @@ def cli():
 @click.option('--single', type=str, help='Ingest a single PDF file by name')
 def ingest(force, single):
     """Ingest PDF documents into vector store."""
+    from .agents.ingestion_agent import ingestion_agent
+
     console.print(Panel("[bold blue]Document Ingestion[/bold blue]"))
 
     if single:
@@ -78,7 +85,8 @@ def ingest(force, single):
 @cli.command()
 @click.option('--question', '-q', type=str, help='Question to ask')
 @click.option('--interactive', '-i', is_flag=True, help='Interactive mode')
-def query(question, interactive):
+@click.option('--stream', is_flag=True, help='Print the answer as it is generated')
+def query(question, interactive, stream):
     """Query the document store using multi-agent system."""
     console.print(Panel("[bold blue]Multi-Agent Query System[/bold blue]"))
 
@@ -97,25 +105,54 @@ def query(question, interactive):
                 continue
 
             # Run query
-            _execute_query(question)
+            _execute_query(question, stream=stream)
             console.print()  # Blank line
 
     elif question:
         # Single question mode
-        _execute_query(question)
+        _execute_query(question, stream=stream)
 
     else:
         console.print("[red]Error: Please provide a question with -q or use -i for interactive mode[/red]")
 
 
-def _execute_query(question: str):
+def _execute_query(question: str, stream: bool = False):
     """Execute a query and display results."""
+    if stream:
+        _execute_query_streaming(question)
+        return
+
+    from .agents.graph import run_multi_agent_query_sync
+
     with console.status("[bold green]Processing query (agents running in parallel)..."):
         result = run_multi_agent_query_sync(question)
 
     # Display answer
     console.print(Panel(result["answer"], title="[bold green]Answer[/bold green]", border_style="green"))
 
+    _print_result_details(result)
+
+
+def _execute_query_streaming(question: str):
+    """Execute a query, printing the answer as it streams in."""
+    from .agents.graph import stream_multi_agent_query_sync
+
+    frames = stream_multi_agent_query_sync(question)
+
+    # Agents run first; the first frame arrives once synthesis starts
+    with console.status("[bold green]Processing query (agents running in parallel)..."):
+        result = next(frames)
+
+    console.print("[bold green]Answer[/bold green]")
+    for frame in frames:
+        console.print(frame["delta"], end="", markup=False, highlight=False)
+    console.print()
+
+    _print_result_details(result)
+
+
+def _print_result_details(result: dict):
+    """Display confidences, source mix and citations for a query result."""
     # Display confidence scores
     console.print(f"\n[bold]Confidence:[/bold] {result['confidence']:.1%}")
     console.print(f"[bold]Primary Source:[/bold] {result['primary_source']}")
@@ -144,6 +181,8 @@ def _execute_query(question: str):
 @cli.command()
 def stats():
     """Show vector store statistics."""
+    from .vectorstore.vector_store import get_collection_stats
+
     console.print(Panel("[bold blue]Vector Store Statistics[/bold blue]"))
 
     stats = get_collection_stats()
@@ -173,6 +212,8 @@ def stats():
 @click.confirmation_option(prompt='Are you sure you want to delete the entire vector store?')
 def reset():
     """Reset (delete) the vector store."""
+    from .vectorstore.vector_store import delete_collection
+
     console.print("[yellow]Deleting vector store...[/yellow]")
 
     try:
@@ -182,13 +223,55 @@ def reset():
         console.print(f"[red]Error: {e}[/red]")
 
 
+def _list_pdf_files(directory: Path) -> List[Path]:
+    """
+    List the PDF files in a directory with a single scandir pass.
+
+    DirEntry.is_file() uses the file type returned by the directory read,
+    so no extra stat call is made per entry.
+
+    Returns:
+        list: PDF paths sorted by name (empty if the directory is missing)
+    """
+    if not directory.is_dir():
+        return []
+
+    with os.scandir(directory) as entries:
+        return sorted(
+            Path(entry.path) for entry in entries
+            if entry.name.lower().endswith(".pdf") and entry.is_file()
+        )
+
+
+def _validate_one(pdf_path: Path) -> Tuple[Path, bool, str]:
+    """
+    Validate one PDF inside a worker process.
+
+    Returns:
+        tuple: (pdf_path, ok, message), where message explains a failure
+    """
+    from .utils.validators import validate_pdf_file
+    from .utils.pdf_extractor import is_text_extractable
+
+    try:
+        validate_pdf_file(pdf_path)
+
+        # Check if text is extractable
+        if not is_text_extractable(pdf_path):
+            return pdf_path, False, "no extractable text - may be scanned"
+        return pdf_path, True, ""
+
+    except Exception as e:
+        return pdf_path, False, str(e)
+
+
 @cli.command()
 def validate():
     """Validate PDFs in documents directory."""
     console.print(Panel("[bold blue]PDF Validation[/bold blue]"))
 
     docs_path = get_documents_path()
-    pdf_files = list(docs_path.glob("*.pdf"))
+    pdf_files = _list_pdf_files(docs_path)
 
     if not pdf_files:
         console.print(f"[red]No PDF files found in {docs_path}[/red]")
@@ -196,24 +279,18 @@ def validate():
 
     console.print(f"Found {len(pdf_files)} PDF files\n")
 
-    from .utils.validators import validate_pdf_file
-    from .utils.pdf_extractor import is_text_extractable
-
     valid_count = 0
     invalid_files = []
 
-    for pdf_path in track(pdf_files, description="Validating PDFs"):
-        try:
-            validate_pdf_file(pdf_path)
-
-            # Check if text is extractable
-            if not is_text_extractable(pdf_path):
-                invalid_files.append(f"{pdf_path.name} (no extractable text - may be scanned)")
-            else:
+    # Each PDF is parsed independently and parsing is CPU-bound, so fan out across processes
+    max_workers = min(os.cpu_count() or 1, len(pdf_files))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(_validate_one, pdf_files)
+        for pdf_path, ok, message in track(results, total=len(pdf_files), description="Validating PDFs"):
+            if ok:
                 valid_count += 1
-
-        except Exception as e:
-            invalid_files.append(f"{pdf_path.name} ({str(e)})")
+            else:
+                invalid_files.append(f"{pdf_path.name} ({message})")
 
     # Display results
     console.print(f"\n[green]Valid PDFs: {valid_count}[/green]")
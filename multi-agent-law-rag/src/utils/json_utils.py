@@ -0,0 +1,36 @@
+"""
+JSON parsing helpers for LLM responses.
+"""
+
+import json
+
+import orjson
+
+_DECODER = json.JSONDecoder()
+
+
+def parse_llm_json(content: str) -> dict:
+    """
+    Parse the JSON object in an LLM response.
+
+    Args:
+        content: Raw model output (may be wrapped in ```json fences or prose)
+
+    Returns:
+        dict: Parsed object
+
+    Raises:
+        ValueError: If no valid JSON object is found
+    """
+    # Outermost {...} span, with or without markdown code fences around it
+    start = content.find("{")
+    end = content.rfind("}")
+    if start == -1 or end < start:
+        raise ValueError("No JSON object in LLM response")
+
+    try:
+        return orjson.loads(content[start:end + 1])
+    except orjson.JSONDecodeError:
+        # Prose with braces after the object, or syntax only the stdlib
+        # parser tolerates (e.g. NaN): decode the first complete object
+        return _DECODER.raw_decode(content, start)[0]
@@ -0,0 +1,73 @@
+"""
+Shared HTTP clients for OpenAI chat and embedding models.
+
+Every ChatOpenAI instance (and the sync side of OpenAIEmbeddings) would
+otherwise own its own connection pool, so the RAG, temporal and supervisor calls of one query each
+pay for a fresh TCP/TLS handshake. These process-wide clients keep
+connections alive (and multiplex them over HTTP/2 when the optional h2
+package is installed).
+"""
+
+import os
+from functools import lru_cache
+from typing import Any, Dict
+
+import httpx
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+from ..config import settings
+
+try:
+    import h2  # noqa: F401 - enables httpx HTTP/2 support
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64)
+
+
+@lru_cache(maxsize=None)
+def get_http_client() -> httpx.Client:
+    """Process-wide sync HTTP client for OpenAI requests."""
+    return DefaultHttpxClient(limits=_LIMITS, http2=HTTP2_AVAILABLE)
+
+
+@lru_cache(maxsize=None)
+def get_async_http_client() -> httpx.AsyncClient:
+    """Process-wide async HTTP client for OpenAI requests."""
+    return new_async_http_client()
+
+
+def new_async_http_client() -> httpx.AsyncClient:
+    """
+    Unshared async HTTP client, for work that runs on a short-lived event loop.
+
+    Pooled async connections are bound to the loop that opened them, so code
+    driven by asyncio.run should open one of these per run and close it.
+    """
+    return DefaultAsyncHttpxClient(limits=_LIMITS, http2=HTTP2_AVAILABLE)
+
+
+def _reset_clients():
+    """Forked workers must not reuse the parent's open connections."""
+    get_http_client.cache_clear()
+    get_async_http_client.cache_clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_clients)
+
+
+def shared_client_kwargs() -> Dict[str, Any]:
+    """
+    ChatOpenAI keyword arguments for the shared clients.
+
+    Returns:
+        dict: http_client, http_async_client and max_retries (the OpenAI
+              client retries 429/5xx responses with exponential backoff)
+    """
+    return {
+        "http_client": get_http_client(),
+        "http_async_client": get_async_http_client(),
+        "max_retries": settings.MAX_RETRIES,
+    }
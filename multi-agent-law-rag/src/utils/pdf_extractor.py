@@ -4,6 +4,7 @@ PDF text extraction with Greek language support.
 
 from pathlib import Path
 import pdfplumber
+from pypdf import PdfReader
 
 from .validators import validate_pdf_file
 
@@ -15,9 +16,8 @@ def extract_text_from_pdf(pdf_path: str | Path, fallback: bool = True) -> str:
     # Validate PDF
     validate_pdf_file(pdf_path)
 
-    # Try pdfplumber FIRST (captures headers better for Greek FEK documents)
     try:
-        text = _extract_with_pdfplumber(pdf_path)
+        text = _extract_pages(pdf_path)
         if text and len(text.strip()) > 0:
             return text
     except:
@@ -26,26 +26,69 @@ def extract_text_from_pdf(pdf_path: str | Path, fallback: bool = True) -> str:
     return ""
 
 
-def _extract_with_pdfplumber(pdf_path: Path) -> str:
-    """Extract text using pdfplumber library."""
-    text_parts = []
+def _extract_pages(pdf_path: Path) -> str:
+    """
+    Extract text page by page with pypdf, falling back to pdfplumber.
+
+    pdfplumber runs a full layout analysis per page, which dominates ingestion
+    time; pypdf is several times faster on text-native pages. The first page
+    always goes through pdfplumber because it captures the FEK header (issue
+    date, ΦΕΚ number) that pypdf drops, and metadata extraction relies on it.
+    """
+    reader = PdfReader(str(pdf_path))
 
     with pdfplumber.open(str(pdf_path)) as pdf:
-        for page in pdf.pages:
-            try:
-                page_text = page.extract_text()
-                if page_text:
-                    text_parts.append(page_text)
-            except:
-                continue
+        text_parts = [None] * len(pdf.pages)
+
+        for i, page in enumerate(pdf.pages):
+            page_text = _extract_with_pypdf(reader, i) if i > 0 else ""
+            if not page_text:
+                page_text = _extract_with_pdfplumber(page)
+            text_parts[i] = page_text
+            page.close()
 
-    return "\n\n".join(text_parts)
+    return "\n\n".join(part for part in text_parts if part)
 
 
-def is_text_extractable(pdf_path: str | Path) -> bool:
-    """Check if PDF has extractable text."""
+def _extract_with_pypdf(reader: PdfReader, page_number: int) -> str:
+    """Extract one page's text using pypdf ("" if it fails)."""
     try:
-        text = extract_text_from_pdf(pdf_path, fallback=True)
-        return len(text.strip()) >= 100
+        return reader.pages[page_number].extract_text() or ""
+    except Exception:
+        return ""
+
+
+def _extract_with_pdfplumber(page) -> str:
+    """Extract one page's text using pdfplumber ("" if it fails)."""
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        return ""
+
+
+def is_text_extractable(pdf_path: str | Path, min_chars: int = 100) -> bool:
+    """
+    Check if PDF has extractable text.
+
+    Pages are read one at a time (pypdf first, pdfplumber if pypdf finds
+    nothing) and the check stops as soon as min_chars characters have been
+    seen, so text-native PDFs are usually decided after the first page.
+    """
+    try:
+        pdf_path = Path(pdf_path)
+        validate_pdf_file(pdf_path)
+        reader = PdfReader(str(pdf_path))
+
+        with pdfplumber.open(str(pdf_path)) as pdf:
+            char_count = 0
+            for i, page in enumerate(pdf.pages):
+                page_text = _extract_with_pypdf(reader, i) or _extract_with_pdfplumber(page)
+                page.close()
+
+                char_count += len(page_text.strip())
+                if char_count >= min_chars:
+                    return True
+
+        return False
     except:
         return False
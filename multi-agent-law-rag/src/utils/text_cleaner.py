@@ -5,6 +5,48 @@ Greek text normalization and cleaning utilities.
 import re
 import unicodedata
 
+import regex
+
+# Whitespace
+_RE_SPACES = re.compile(r' +')
+_RE_NEWLINES = re.compile(r'\n{3,}')
+# Whitespace (other than the newline itself) on either side of a line break
+_RE_LINE_EDGE_WS = re.compile(r'[^\S\n]+\n[^\S\n]*|\n[^\S\n]+')
+
+# Legal structure markers
+_RE_ARTICLE = re.compile(r'(?<!\n\n)(Άρθρο\s+\d+)')
+_RE_PARAGRAPH = re.compile(r'(?<!\n)(Παράγραφος\s+\d+)')
+_RE_NUMBERED = re.compile(r'(?<!\n)(\d+\.)\s+')
+_RE_GREEK_LETTER = re.compile(r'(?<!\n)([α-ω]\.)\s+')
+
+# Unicode category C (control, format, surrogate, private use, unassigned) except
+# newline and tab; the regex module matches categories in C, not per character
+_RE_CONTROL = regex.compile(r'[\p{C}--[\n\t]]', regex.V1)
+# In ASCII, category C is exactly the C0 controls and DEL
+_ASCII_CONTROL_BYTES = bytes([b for b in range(0x20) if b not in (0x09, 0x0A)] + [0x7F])
+
+
+class _AccentStripTable(dict):
+    """
+    str.translate table mapping each character to its form without combining
+    marks (NFD, drop category Mn, NFC), memoized per code point.
+    """
+
+    def __missing__(self, codepoint: int):
+        decomposed = unicodedata.normalize("NFD", chr(codepoint))
+        base = unicodedata.normalize("NFC", "".join(c for c in decomposed if unicodedata.category(c) != "Mn"))
+        value = codepoint if base == chr(codepoint) else base
+        self[codepoint] = value
+        return value
+
+
+_ACCENT_STRIP_TABLE = _AccentStripTable()
+
+# Precompute the Greek and Coptic and Greek Extended blocks
+for _codepoint in (*range(0x0370, 0x0400), *range(0x1F00, 0x2000)):
+    _ACCENT_STRIP_TABLE[_codepoint]
+del _codepoint
+
 
 def normalize_greek_text(text: str) -> str:
     """Normalize Greek text using Unicode NFC normalization."""
@@ -18,10 +60,9 @@ def remove_extra_whitespace(text: str) -> str:
     if not text:
         return text
 
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
+    text = _RE_SPACES.sub(' ', text)
+    text = _RE_NEWLINES.sub('\n\n', text)
+    text = _RE_LINE_EDGE_WS.sub('\n', text)
 
     return text.strip()
 
@@ -31,10 +72,10 @@ def preserve_legal_structure(text: str) -> str:
     if not text:
         return text
 
-    text = re.sub(r'(?<!\n\n)(Άρθρο\s+\d+)', r'\n\n\1', text)
-    text = re.sub(r'(?<!\n)(Παράγραφος\s+\d+)', r'\n\1', text)
-    text = re.sub(r'(?<!\n)(\d+\.)\s+', r'\n\1 ', text)
-    text = re.sub(r'(?<!\n)([α-ω]\.)\s+', r'\n\1 ', text)
+    text = _RE_ARTICLE.sub(r'\n\n\1', text)
+    text = _RE_PARAGRAPH.sub(r'\n\1', text)
+    text = _RE_NUMBERED.sub(r'\n\1 ', text)
+    text = _RE_GREEK_LETTER.sub(r'\n\1 ', text)
 
     return text
 
@@ -45,9 +86,7 @@ def handle_accents(text: str, remove: bool = False) -> str:
         return text
 
     if remove:
-        text = unicodedata.normalize("NFD", text)
-        text = "".join(c for c in text if unicodedata.category(c) != "Mn")
-        text = unicodedata.normalize("NFC", text)
+        text = text.translate(_ACCENT_STRIP_TABLE)
     else:
         text = unicodedata.normalize("NFC", text)
 
@@ -59,8 +98,11 @@ def remove_control_characters(text: str) -> str:
     if not text:
         return text
 
-    text = "".join(char for char in text if char in ('\n', '\t') or unicodedata.category(char)[0] != "C")
-    return text
+    # str.isascii() is a flag check; pure-ASCII text can be filtered with a bytes delete
+    if text.isascii():
+        return text.encode("ascii").translate(None, _ASCII_CONTROL_BYTES).decode("ascii")
+
+    return _RE_CONTROL.sub("", text)
 
 
 def clean_pdf_artifacts(text: str) -> str:
@@ -80,8 +122,9 @@ def clean_text_for_legal_docs(text: str, preserve_structure: bool = True) -> str
     if not text:
         return text
 
+    # One regex pass; it also drops the PDF artifacts (form feed, soft
+    # hyphen and zero-width space are all category C)
     text = remove_control_characters(text)
-    text = clean_pdf_artifacts(text)
     text = normalize_greek_text(text)
 
     if preserve_structure:
@@ -3,6 +3,7 @@ Input validation utilities.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
 from pypdf import PdfReader
 
@@ -17,18 +18,31 @@ def validate_pdf_file(pdf_path: str | Path) -> bool:
     if pdf_path.suffix.lower() != ".pdf":
         raise ValueError(f"File is not a PDF: {pdf_path}")
 
-    file_size = pdf_path.stat().st_size
+    stat = pdf_path.stat()
+    file_size = stat.st_size
     if file_size == 0:
         raise ValueError(f"PDF file is empty: {pdf_path}")
 
     if file_size > 100 * 1024 * 1024:  # 100MB
         raise ValueError(f"PDF file too large: {pdf_path}")
 
+    _validate_pdf_structure(str(pdf_path), stat.st_mtime_ns, file_size)
+
+    return True
+
+
+@lru_cache(maxsize=4096)
+def _validate_pdf_structure(path: str, mtime_ns: int, size: int) -> None:
+    """
+    Parse the PDF once and check it has pages.
+
+    Cached on (path, mtime, size): validation runs before every extraction
+    and extractability check, and an unchanged file only needs parsing once.
+    Failures raise and are therefore not cached.
+    """
     try:
-        reader = PdfReader(str(pdf_path))
+        reader = PdfReader(path, strict=False)
         if len(reader.pages) == 0:
-            raise ValueError(f"PDF has no pages: {pdf_path}")
+            raise ValueError(f"PDF has no pages: {path}")
     except Exception as e:
         raise ValueError(f"Failed to read PDF: {e}")
-
-    return True
@@ -0,0 +1,224 @@
+"""
+Packed on-disk BM25 index for the keyword half of hybrid search.
+
+The corpus is stored as posting lists: for every term, the documents it
+occurs in and its frequency there (a CSC-style sparse term/document matrix),
+memory-mapped at query time. Scoring reproduces rank_bm25's BM25Okapi
+exactly, but only touches the postings of the query terms instead of one
+Python dict of term frequencies per chunk.
+"""
+
+import json
+import re
+from pathlib import Path
+from typing import Callable, List, Optional
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.retrievers import BaseRetriever
+from langchain.schema import Document
+
+from ..utils.text_cleaner import handle_accents
+
+BM25_DIRNAME = "bm25_index"
+
+# Bumped when tokenization changes, so indexes built with the old tokens are rebuilt
+BM25_FORMAT_VERSION = 2
+
+_RE_WORD = re.compile(r"\w+")
+
+
+def greek_tokenizer(text: str) -> List[str]:
+    """
+    Accent- and case-insensitive word tokenizer for Greek text.
+
+    "Νόμος", "ΝΟΜΟΣ" and "νομος" become the same token, and punctuation is
+    split off ("4808/2021," -> "4808", "2021"). Accent stripping is a
+    str.translate over a precomputed table and splitting a single regex
+    findall, so both run in C.
+    """
+    return _RE_WORD.findall(handle_accents(text, remove=True).casefold())
+
+
+class PackedBM25:
+    """BM25Okapi over per-term posting lists."""
+
+    def __init__(
+        self,
+        vocab: dict,
+        idf: np.ndarray,
+        term_offsets: np.ndarray,
+        postings: np.ndarray,
+        term_freqs: np.ndarray,
+        doc_len: np.ndarray,
+        doc_ids: List[str],
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.vocab = vocab
+        self.idf = idf
+        self.term_offsets = term_offsets
+        self.postings = postings
+        self.term_freqs = term_freqs
+        self.doc_len = doc_len
+        self.doc_ids = doc_ids
+        self.k1 = k1
+        self.b = b
+
+        doc_len = doc_len.astype(np.float64)
+        avgdl = doc_len.mean() if doc_len.size else 0.0
+        # Per-document length normalization is query independent, so precompute it
+        self._norm = k1 * (1 - b + b * doc_len / avgdl) if avgdl else np.full(doc_len.size, k1)
+
+    @classmethod
+    def build(
+        cls,
+        texts: List[str],
+        doc_ids: List[str],
+        tokenizer: Callable[[str], List[str]] = greek_tokenizer,
+        epsilon: float = 0.25,
+    ) -> "PackedBM25":
+        """
+        Tokenize a corpus and build its posting lists.
+
+        Args:
+            texts: Chunk texts
+            doc_ids: Docstore id for each text
+            tokenizer: Text -> tokens
+            epsilon: idf floor factor (as in rank_bm25)
+
+        Returns:
+            PackedBM25: Index ready for scoring (call save() to persist)
+        """
+        vocab = {}
+        token_ids = []
+        doc_len = []
+
+        for text in texts:
+            tokens = tokenizer(text)
+            token_ids.extend([vocab.setdefault(token, len(vocab)) for token in tokens])
+            doc_len.append(len(tokens))
+
+        corpus_size = len(texts)
+        doc_len = np.array(doc_len, dtype=np.int64)
+        owners = np.repeat(np.arange(corpus_size, dtype=np.int64), doc_len)
+
+        # One sort groups every (term, document) pair; its run lengths are the term frequencies
+        pairs, term_freqs = np.unique(
+            np.array(token_ids, dtype=np.int64) * max(corpus_size, 1) + owners,
+            return_counts=True
+        )
+        terms = pairs // max(corpus_size, 1)
+        doc_freq = np.bincount(terms, minlength=len(vocab))
+        term_offsets = np.concatenate(([0], np.cumsum(doc_freq))).astype(np.int64)
+
+        # idf exactly as BM25Okapi: negative values floored to epsilon * average idf
+        idf = np.log(corpus_size - doc_freq + 0.5) - np.log(doc_freq + 0.5)
+        if idf.size:
+            idf[idf < 0] = epsilon * idf.mean()
+
+        return cls(
+            vocab=vocab,
+            idf=idf,
+            term_offsets=term_offsets,
+            postings=(pairs % max(corpus_size, 1)).astype(np.uint32),
+            term_freqs=term_freqs.astype(np.uint32),
+            doc_len=doc_len,
+            doc_ids=list(doc_ids),
+        )
+
+    def save(self, path: Path):
+        """Write the index files to a directory."""
+        path.mkdir(parents=True, exist_ok=True)
+        np.save(path / "term_offsets.npy", self.term_offsets)
+        np.save(path / "postings.npy", self.postings)
+        np.save(path / "term_freqs.npy", self.term_freqs)
+        np.save(path / "doc_len.npy", self.doc_len)
+        np.save(path / "idf.npy", self.idf)
+        with open(path / "vocab.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": BM25_FORMAT_VERSION, "vocab": self.vocab, "doc_ids": self.doc_ids},
+                f,
+                ensure_ascii=False
+            )
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["PackedBM25"]:
+        """Memory-map an index written by save() (None if missing, unreadable or outdated)."""
+        try:
+            with open(path / "vocab.json", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("version") != BM25_FORMAT_VERSION:
+                return None
+            return cls(
+                vocab=meta["vocab"],
+                idf=np.load(path / "idf.npy"),
+                term_offsets=np.load(path / "term_offsets.npy"),
+                postings=np.load(path / "postings.npy", mmap_mode="r"),
+                term_freqs=np.load(path / "term_freqs.npy", mmap_mode="r"),
+                doc_len=np.load(path / "doc_len.npy"),
+                doc_ids=meta["doc_ids"],
+            )
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def has_overlap(self, query_tokens: List[str]) -> bool:
+        """Check whether any query token occurs in the corpus."""
+        return any(token in self.vocab for token in query_tokens)
+
+    def get_scores(self, query_tokens: List[str]) -> np.ndarray:
+        """
+        BM25 score of every document for the query.
+
+        Args:
+            query_tokens: Tokenized query
+
+        Returns:
+            np.ndarray: Score per document
+        """
+        scores = np.zeros(len(self.doc_ids))
+
+        for token in query_tokens:
+            token_id = self.vocab.get(token)
+            if token_id is None:
+                continue
+
+            # Only the documents containing the term get a non-zero contribution
+            start, end = self.term_offsets[token_id], self.term_offsets[token_id + 1]
+            docs = self.postings[start:end]
+            tf = self.term_freqs[start:end].astype(np.float64)
+
+            scores[docs] += self.idf[token_id] * (tf * (self.k1 + 1) / (tf + self._norm[docs]))
+
+        return scores
+
+    def get_top_n(self, query_tokens: List[str], n: int) -> List[str]:
+        """Docstore ids of the n best-scoring documents (same ordering as rank_bm25)."""
+        scores = self.get_scores(query_tokens)
+        top = np.argsort(scores)[::-1][:n]
+        return [self.doc_ids[i] for i in top]
+
+
+class PackedBM25Retriever(BaseRetriever):
+    """LangChain retriever over a PackedBM25 index and the FAISS docstore."""
+
+    index: PackedBM25
+    docstore: object
+    k: int = 4
+    preprocess_func: Callable[[str], List[str]] = greek_tokenizer
+
+    class Config:
+        arbitrary_types_allowed = True
+
+    def has_vocabulary_overlap(self, query: str) -> bool:
+        """Check whether any query token occurs in the corpus (O(|query|))."""
+        return self.index.has_overlap(self.preprocess_func(query))
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        doc_ids = self.index.get_top_n(self.preprocess_func(query), self.k)
+        return [self.docstore.search(doc_id) for doc_id in doc_ids]
@@ -2,10 +2,14 @@
 Document processing for Greek legal PDFs with LLM-based metadata extraction.
 """
 
+import os
 import re
 import json
+import calendar
+from functools import lru_cache
+from datetime import date, datetime
 from pathlib import Path
-from typing import List, Dict
+from typing import Iterator, List, Dict, Optional
 from langchain.schema import Document
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_openai import ChatOpenAI
@@ -13,11 +17,156 @@ from langchain_openai import ChatOpenAI
 from ..config import settings, get_text_splitter_separators
 from ..utils.pdf_extractor import extract_text_from_pdf
 from ..utils.text_cleaner import clean_text_for_legal_docs
+from ..utils.json_utils import parse_llm_json
+from ..utils.openai_clients import shared_client_kwargs
+from .metadata_cache import metadata_key, get_cached_metadata, store_metadata
+
+
+# FEK series letter by issue ordinal (ΤΕΥΧΟΣ ΠΡΩΤΟ = Α, ...) and by file-name issue code
+_FEK_SERIES_BY_ORDINAL = {'ΠΡΩΤΟ': 'Α', 'ΔΕΥΤΕΡΟ': 'Β', 'ΤΡΙΤΟ': 'Γ', 'ΤΕΤΑΡΤΟ': 'Δ'}
+_FEK_SERIES_BY_CODE = {'01': 'Α', '02': 'Β', '03': 'Γ', '04': 'Δ'}
+_FEK_SERIES_LETTERS = str.maketrans('ABCDabcdαβγδ', 'ΑΒΓΔΑΒΓΔΑΒΓΔ')
+
+_GREEK_MONTHS_GENITIVE = {
+    'Ιανουαρίου': 1, 'Φεβρουαρίου': 2, 'Μαρτίου': 3, 'Απριλίου': 4,
+    'Μαΐου': 5, 'Ιουνίου': 6, 'Ιουλίου': 7, 'Αυγούστου': 8,
+    'Σεπτεμβρίου': 9, 'Οκτωβρίου': 10, 'Νοεμβρίου': 11, 'Δεκεμβρίου': 12,
+}
+
+# First-page masthead: "31 Οκτωβρίου 2025 ΤΕΥΧΟΣ ΠΡΩΤΟ Αρ. Φύλλου 187"
+# (text cleanup may break "Αρ." across a line)
+_FEK_HEADER_RE = re.compile(
+    r'(\d{1,2})\s+([^\W\d_]+)\s+(\d{4})\s+ΤΕΥΧΟΣ\s+([^\W\d_]+)\s+Α\s*ρ\.\s*Φύλλου\s+(\d+)'
+)
+
+# Document type heading right below the masthead ("NOMOΣ" is often typeset with Latin letters)
+_FEK_DOC_TYPES = (
+    (re.compile(r'\s*[NΝ][OΟ][MΜ][OΟ]Σ\s+ΥΠ'), 'Νόμος'),
+    (re.compile(r'\s*ΠΡΟΕΔΡΙΚΟ\s+ΔΙΑΤΑΓΜΑ'), 'Προεδρικό Διάταγμα'),
+    (re.compile(r'\s*Α\s?ΠΟΦΑΣ(?:ΕΙΣ|Η)'), 'Απόφαση'),
+)
+
+# File names: "20230100010.pdf" (year, issue code, number), "ΦΕΚ_123_Α_2023.pdf", "126A.pdf"
+_FEK_FILENAME_ID_RE = re.compile(r'^(\d{4})(0[1-4])(\d{5})$')
+_FEK_FILENAME_YEAR_RE = re.compile(r'(?i)(?:ΦΕΚ[_\s-]?)?(\d+)[_\s-]?([ΑΒΓΔαβγδABCD])[_\s-]?(\d{4})')
+_FEK_FILENAME_RE = re.compile(r'(\d+)([ΑΒΓΔαβγδABCD])?')
+
+# Fields ingestion depends on (date filtering, citations); when the masthead gives
+# all of them the metadata LLM call is skipped and authority/subject stay 'Unknown'
+_REQUIRED_METADATA_FIELDS = ('publication_date', 'fek_number', 'doc_type')
+
+
+# Splitter settings are fixed for the process, so one splitter serves every PDF.
+# Splitting is cheap next to extraction (~20ms vs seconds for a 500k-character
+# FEK), and different chunk boundaries would invalidate every cached embedding.
+_TEXT_SPLITTER = RecursiveCharacterTextSplitter(
+    separators=get_text_splitter_separators(),
+    chunk_size=settings.CHUNK_SIZE,
+    chunk_overlap=settings.CHUNK_OVERLAP,
+    length_function=len,
+    is_separator_regex=False,
+)
+
+
+@lru_cache(maxsize=1)
+def _get_metadata_llm() -> ChatOpenAI:
+    """Metadata extraction model, built once and reused for every PDF."""
+    return ChatOpenAI(
+        model=settings.OPENAI_EXTRACTION_MODEL,
+        temperature=0,
+        openai_api_key=settings.OPENAI_API_KEY,
+        max_tokens=300,
+        **shared_client_kwargs()
+    )
+
+
+# The cached model holds the parent's HTTP clients, which forked workers must not share
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_get_metadata_llm.cache_clear)
+
+
+def _parse_fek_header(text_sample: str) -> Dict[str, str]:
+    """
+    Read publication date, ΦΕΚ number and document type from the first-page masthead.
+
+    Args:
+        text_sample: Beginning of the document text
+
+    Returns:
+        dict: The fields found (empty if there is no recognizable masthead)
+    """
+    match = _FEK_HEADER_RE.search(text_sample)
+    if not match:
+        return {}
+
+    day, month_name, year, ordinal, sheet = match.groups()
+    found = {}
+
+    month = _GREEK_MONTHS_GENITIVE.get(month_name)
+    if month:
+        try:
+            found['publication_date'] = date(int(year), month, int(day)).isoformat()
+        except ValueError:
+            pass
+
+    series = _FEK_SERIES_BY_ORDINAL.get(ordinal.replace('∆', 'Δ'))
+    if series:
+        found['fek_number'] = f"{sheet}/{series}"
+
+    for pattern, doc_type in _FEK_DOC_TYPES:
+        if pattern.match(text_sample, match.end()):
+            found['doc_type'] = doc_type
+            break
+
+    return found
+
+
+def _parse_fek_filename(filename: str) -> Dict[str, str]:
+    """
+    Read ΦΕΚ number (and year, when present) from a PDF file name.
+
+    Args:
+        filename: PDF filename
+
+    Returns:
+        dict: fek_number and, when the name carries one, publication_year (used
+              to check the extracted date; the day is unknown, so it is not a date)
+    """
+    stem = Path(filename).stem
+
+    match = _FEK_FILENAME_ID_RE.match(stem)
+    if match:
+        year, code, num = match.groups()
+        return {
+            'fek_number': f"{int(num)}/{_FEK_SERIES_BY_CODE[code]}",
+            'publication_year': int(year),
+        }
+
+    match = _FEK_FILENAME_YEAR_RE.search(stem)
+    if match:
+        num, series, year = match.groups()
+        return {
+            'fek_number': f"{num}/{series.translate(_FEK_SERIES_LETTERS)}",
+            'publication_year': int(year),
+        }
+
+    match = _FEK_FILENAME_RE.search(stem)
+    if match:
+        series = match.group(2).translate(_FEK_SERIES_LETTERS) if match.group(2) else 'Α'
+        return {'fek_number': f"{match.group(1)}/{series}"}
+
+    return {}
 
 
 def extract_fek_metadata(pdf_text: str, filename: str = "", debug: bool = False) -> Dict[str, any]:
     """
-    Extract ΦΕΚ metadata using LLM.
+    Extract ΦΕΚ metadata, reading the masthead with regexes before asking the LLM.
+
+    Fields parsed from the first-page masthead are kept as is. When it gives
+    the date, ΦΕΚ number and document type the LLM is skipped (authority and
+    subject stay 'Unknown'); otherwise the LLM fills the remaining fields.
+    File-name values are a fallback the LLM may override, and a year in the
+    file name rejects an LLM publication_date from a different year.
 
     Args:
         pdf_text: Full text extracted from PDF
@@ -36,12 +185,9 @@ def extract_fek_metadata(pdf_text: str, filename: str = "", debug: bool = False)
     }
 
     # Extract from filename as fallback
-    if filename:
-        file_match = re.search(r'(\d+)([ΑΒΓΔαβγδABCD])?', filename)
-        if file_match:
-            num = file_match.group(1)
-            series = file_match.group(2) if file_match.group(2) else 'Α'
-            metadata['fek_number'] = f"{num}/{series}"
+    filename_metadata = _parse_fek_filename(filename) if filename else {}
+    filename_year = filename_metadata.pop('publication_year', None)
+    metadata.update(filename_metadata)
 
     # Process first 1000 characters from first page for better date extraction
     text_sample = pdf_text[:1000] if pdf_text else ""
@@ -49,6 +195,19 @@ def extract_fek_metadata(pdf_text: str, filename: str = "", debug: bool = False)
     if not text_sample:
         return metadata
 
+    # Masthead fields are exact; the LLM is only needed for what they don't cover
+    header_metadata = _parse_fek_header(text_sample)
+    metadata.update(header_metadata)
+    if all(key in header_metadata for key in _REQUIRED_METADATA_FIELDS):
+        return metadata
+
+    # Re-ingesting an unchanged PDF reuses the earlier extraction (debug always asks the LLM)
+    cache_key = metadata_key(filename, text_sample, settings.OPENAI_EXTRACTION_MODEL)
+    if not debug:
+        cached = get_cached_metadata(cache_key)
+        if cached is not None:
+            return cached
+
     if debug:
         print("=" * 80)
         print(f"DEBUG: Processing file: {filename}")
@@ -60,12 +219,7 @@ def extract_fek_metadata(pdf_text: str, filename: str = "", debug: bool = False)
         print()
 
     try:
-        llm = ChatOpenAI(
-            model="gpt-4o-mini",
-            temperature=0,
-            openai_api_key=settings.OPENAI_API_KEY,
-            max_tokens=300
-        )
+        llm = _get_metadata_llm()
 
         # More specific Greek prompt focusing on dates at top of first page
         prompt = f"""Ανέλυσε αυτό το ΦΕΚ έγγραφο. Η ΗΜΕΡΟΜΗΝΙΑ είναι πάντα στην κορυφή της πρώτης σελίδας.
@@ -94,18 +248,22 @@ def extract_fek_metadata(pdf_text: str, filename: str = "", debug: bool = False)
             print("-" * 80)
             print()
 
-        # Handle markdown code blocks if present
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-            content = content.strip()
-
-        llm_data = json.loads(content)
+        # Extract the JSON object (handles markdown code blocks)
+        llm_data = parse_llm_json(content)
         for key, value in llm_data.items():
-            if value and value != "null" and value != "":
+            if value and value != "null" and value != "" and key not in header_metadata:
                 metadata[key] = value
 
+        # The ΦΕΚ id in the file name carries the year; a date from another year is misread
+        if (
+            filename_year is not None
+            and 'publication_date' not in header_metadata
+            and not str(metadata.get('publication_date') or '').startswith(str(filename_year))
+        ):
+            metadata['publication_date'] = None
+
+        store_metadata(cache_key, metadata)
+
         if debug:
             print(f"Extracted Metadata:")
             print("-" * 80)
@@ -114,7 +272,7 @@ def extract_fek_metadata(pdf_text: str, filename: str = "", debug: bool = False)
             print()
 
     except Exception as e:
-        # If LLM fails, keep fallback metadata (filename-based)
+        # If LLM fails, keep the masthead and filename-based metadata
         if debug:
             print(f"ERROR: {e}")
             print("=" * 80)
@@ -123,6 +281,24 @@ def extract_fek_metadata(pdf_text: str, filename: str = "", debug: bool = False)
     return metadata
 
 
+def publication_timestamp(date_str: Optional[str]) -> Optional[int]:
+    """
+    Convert an ISO publication date to integer unix seconds (UTC midnight).
+
+    Args:
+        date_str: Date as "YYYY-MM-DD" (or full ISO datetime)
+
+    Returns:
+        int: Unix timestamp, or None if missing or unparseable
+    """
+    if not date_str:
+        return None
+    try:
+        return calendar.timegm(datetime.fromisoformat(date_str).timetuple())
+    except (TypeError, ValueError):
+        return None
+
+
 def process_pdf_to_chunks(
     pdf_path: str | Path,
     clean_text: bool = True,
@@ -139,13 +315,35 @@ def process_pdf_to_chunks(
     Returns:
         List[Document]: Chunked documents with metadata
     """
+    return list(iter_pdf_chunks(pdf_path, clean_text, extract_metadata))
+
+
+def iter_pdf_chunks(
+    pdf_path: str | Path,
+    clean_text: bool = True,
+    extract_metadata: bool = True
+) -> Iterator[Document]:
+    """
+    Yield a PDF's chunks one Document at a time.
+
+    Same processing as process_pdf_to_chunks, but consumers that stream
+    chunks onward never hold every Document of a large PDF at once.
+
+    Args:
+        pdf_path: Path to PDF file
+        clean_text: Whether to clean/normalize text
+        extract_metadata: Whether to extract ΦΕΚ metadata using LLM
+
+    Yields:
+        Document: Chunk with metadata, in document order
+    """
     pdf_path = Path(pdf_path)
 
     # Extract text
     full_text = extract_text_from_pdf(pdf_path)
 
     if not full_text or len(full_text.strip()) < 50:
-        return []
+        return
 
     # Clean text if requested
     if clean_text:
@@ -156,33 +354,22 @@ def process_pdf_to_chunks(
     if extract_metadata:
         doc_metadata = extract_fek_metadata(full_text, pdf_path.name)
 
+    # Numeric date for range filtering and sorting
+    publication_ts = publication_timestamp(doc_metadata.get('publication_date'))
+    if publication_ts is not None:
+        doc_metadata['publication_ts'] = publication_ts
+
     # Add source info
     doc_metadata['source'] = pdf_path.name
     doc_metadata['source_path'] = str(pdf_path.absolute())
 
-    # Create text splitter
-    text_splitter = RecursiveCharacterTextSplitter(
-        separators=get_text_splitter_separators(),
-        chunk_size=settings.CHUNK_SIZE,
-        chunk_overlap=settings.CHUNK_OVERLAP,
-        length_function=len,
-        is_separator_regex=False,
-    )
-
     # Split into chunks
-    chunks = text_splitter.split_text(full_text)
+    chunks = _TEXT_SPLITTER.split_text(full_text)
 
     # Create Document objects
-    documents = []
+    total_chunks = len(chunks)
     for i, chunk in enumerate(chunks):
-        chunk_metadata = doc_metadata.copy()
-        chunk_metadata['chunk_index'] = i
-        chunk_metadata['total_chunks'] = len(chunks)
-
-        doc = Document(
+        yield Document(
             page_content=chunk,
-            metadata=chunk_metadata
+            metadata={**doc_metadata, 'chunk_index': i, 'total_chunks': total_chunks}
         )
-        documents.append(doc)
-
-    return documents
@@ -0,0 +1,97 @@
+"""
+Persistent SQLite cache for chunk embeddings.
+
+Chunks are keyed by sha256(chunk_text + embedding_model), so re-ingesting an
+unchanged PDF (or rebuilding a deleted FAISS index) costs no embedding calls.
+"""
+
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List
+
+import numpy as np
+
+from ..config import get_vectorstore_path
+
+EMBEDDING_CACHE_FILENAME = "embedding_cache.sqlite3"
+
+_connection = None
+_lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Open (once) the cache database in the vectorstore directory."""
+    global _connection
+
+    if _connection is None:
+        db_path = get_vectorstore_path() / EMBEDDING_CACHE_FILENAME
+        _connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "hash TEXT PRIMARY KEY, model TEXT, vector BLOB)"
+        )
+        _connection.commit()
+
+    return _connection
+
+
+def chunk_hash(text: str, model: str) -> str:
+    """Hash a chunk's text together with the embedding model id."""
+    return hashlib.sha256(text.encode("utf-8") + model.encode("utf-8")).hexdigest()
+
+
+def get_cached_embeddings(hashes: List[str]) -> Dict[str, np.ndarray]:
+    """
+    Look up stored embeddings.
+
+    Args:
+        hashes: Chunk hashes from chunk_hash()
+
+    Returns:
+        dict: hash -> float32 embedding for every hash found in the cache
+    """
+    found = {}
+    if not hashes:
+        return found
+
+    with _lock:
+        conn = _get_connection()
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(hashes), 500):
+            batch = hashes[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            rows = conn.execute(
+                f"SELECT hash, vector FROM embedding_cache WHERE hash IN ({placeholders})",
+                batch
+            ).fetchall()
+            for h, blob in rows:
+                found[h] = np.frombuffer(blob, dtype=np.float32)
+
+    return found
+
+
+def store_embeddings(hashes: List[str], vectors: List[List[float]], model: str):
+    """
+    Store embeddings as float32 blobs.
+
+    Args:
+        hashes: Chunk hashes from chunk_hash()
+        vectors: Embeddings aligned with hashes
+        model: Embedding model id
+    """
+    if not hashes:
+        return
+
+    rows = [
+        (h, model, np.asarray(vec, dtype=np.float32).tobytes())
+        for h, vec in zip(hashes, vectors)
+    ]
+
+    with _lock:
+        conn = _get_connection()
+        conn.executemany(
+            "INSERT OR REPLACE INTO embedding_cache (hash, model, vector) VALUES (?, ?, ?)",
+            rows
+        )
+        conn.commit()
@@ -2,20 +2,169 @@
 Embedding model configuration and management for Greek text.
 """
 
-from typing import List
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import AsyncIterator, List, Optional, Tuple
+
+import httpx
+import tiktoken
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..config import settings
+from ..utils.openai_clients import get_http_client, new_async_http_client
+
+
+def get_embedding_model(model_name: str = None) -> OpenAIEmbeddings:
+    """Get configured OpenAI embeddings model with Greek text support (shared per model)."""
+    return _get_embedding_model(model_name or settings.OPENAI_EMBEDDING_MODEL)
+
+
+@lru_cache(maxsize=None)
+def _get_embedding_model(model_name: str) -> OpenAIEmbeddings:
+    """Build the embeddings client once per model, on the process-wide sync HTTP pool."""
+    return _build_embedding_model(model_name)
 
 
-def get_embedding_model() -> OpenAIEmbeddings:
-    """Get configured OpenAI embeddings model with Greek text support."""
-    embeddings = OpenAIEmbeddings(
-        model=settings.OPENAI_EMBEDDING_MODEL,
+def _build_embedding_model(
+    model_name: str,
+    http_async_client: Optional[httpx.AsyncClient] = None
+) -> OpenAIEmbeddings:
+    """Construct an embeddings client (sync requests share the chat models' pool)."""
+    return OpenAIEmbeddings(
+        model=model_name,
         openai_api_key=settings.OPENAI_API_KEY,
+        # Send each of our token-packed batches as a single request
+        chunk_size=settings.MAX_CHUNKS_PER_EMBEDDING_BATCH,
+        http_client=get_http_client(),
+        http_async_client=http_async_client,
     )
-    return embeddings
+
+
+@asynccontextmanager
+async def loop_embedding_model(model_name: str = None) -> AsyncIterator[OpenAIEmbeddings]:
+    """
+    Embeddings client whose async connections belong to the running event loop.
+
+    Ingestion drives embedding with asyncio.run, a new loop per call, and
+    pooled async connections cannot outlive the loop that opened them. The
+    cached model from get_embedding_model is process-wide, so its async client
+    must not be used here; this one is closed when the block exits.
+
+    Args:
+        model_name: Embedding model (uses OPENAI_EMBEDDING_MODEL if None)
+
+    Yields:
+        OpenAIEmbeddings: Client to use inside the current event loop only
+    """
+    async with new_async_http_client() as http_async_client:
+        yield _build_embedding_model(model_name or settings.OPENAI_EMBEDDING_MODEL, http_async_client)
+
+
+# Forked workers must not reuse the parent's open connections
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_get_embedding_model.cache_clear)
+
+
+@lru_cache(maxsize=None)
+def _get_token_encoding(model_name: str) -> Optional[tiktoken.Encoding]:
+    """Tokenizer used by an embedding model (None if tiktoken can't load one)."""
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+def pack_by_tokens(
+    texts: List[str],
+    model_name: str = None,
+    max_tokens: int = None,
+    max_items: int = None
+) -> List[List[str]]:
+    """
+    Greedily pack texts into embedding request batches by token count.
+
+    Args:
+        texts: Texts to embed
+        model_name: Embedding model whose tokenizer counts tokens
+        max_tokens: Token cap per batch (uses MAX_TOKENS_PER_EMBEDDING_BATCH if None)
+        max_items: Input cap per batch (uses MAX_CHUNKS_PER_EMBEDDING_BATCH if None)
+
+    Returns:
+        List[List[str]]: Batches in input order
+    """
+    max_tokens = max_tokens or settings.MAX_TOKENS_PER_EMBEDDING_BATCH
+    max_items = max_items or settings.MAX_CHUNKS_PER_EMBEDDING_BATCH
+
+    encoding = _get_token_encoding(model_name or settings.OPENAI_EMBEDDING_MODEL)
+    if encoding is not None:
+        token_counts = [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+    else:
+        # Fallback: conservative estimate for Greek text
+        token_counts = [len(text) // 2 for text in texts]
+
+    batches = []
+    current_batch = []
+    current_tokens = 0
+
+    for text, n_tokens in zip(texts, token_counts):
+        batch_full = current_tokens + n_tokens > max_tokens or len(current_batch) >= max_items
+        if batch_full and current_batch:
+            batches.append(current_batch)
+            current_batch = []
+            current_tokens = 0
+        current_batch.append(text)
+        current_tokens += n_tokens
+
+    if current_batch:
+        batches.append(current_batch)
+
+    return batches
+
+
+def pack_first_fit_decreasing(
+    token_counts: List[int],
+    max_tokens: int = None,
+    max_items: int = None
+) -> List[List[int]]:
+    """
+    Pack items into as few embedding requests as possible (first-fit decreasing).
+
+    Items are placed largest first into the first batch that still has room
+    under both caps, so uneven chunk sizes don't leave half-empty requests.
+    An item larger than max_tokens gets a batch of its own.
+
+    Args:
+        token_counts: Token count per item
+        max_tokens: Token cap per batch (uses MAX_TOKENS_PER_EMBEDDING_BATCH if None)
+        max_items: Input cap per batch (uses MAX_CHUNKS_PER_EMBEDDING_BATCH if None)
+
+    Returns:
+        List[List[int]]: Item indices per batch
+    """
+    max_tokens = max_tokens or settings.MAX_TOKENS_PER_EMBEDDING_BATCH
+    max_items = max_items or settings.MAX_CHUNKS_PER_EMBEDDING_BATCH
+
+    batches = []
+    batch_tokens = []
+
+    for i in sorted(range(len(token_counts)), key=token_counts.__getitem__, reverse=True):
+        n_tokens = token_counts[i]
+        for b, batch in enumerate(batches):
+            if batch_tokens[b] + n_tokens <= max_tokens and len(batch) < max_items:
+                batch.append(i)
+                batch_tokens[b] += n_tokens
+                break
+        else:
+            batches.append([i])
+            batch_tokens.append(n_tokens)
+
+    return batches
 
 
 @retry(
@@ -23,25 +172,96 @@ def get_embedding_model() -> OpenAIEmbeddings:
     wait=wait_exponential(multiplier=1, min=2, max=10),
     reraise=True
 )
-def batch_embed_documents(
+async def _aembed_batch(batch: List[str], embeddings: OpenAIEmbeddings) -> List[List[float]]:
+    """Embed a single batch asynchronously with retry logic."""
+    return await embeddings.aembed_documents(batch)
+
+
+async def aembed_batches(
+    batches: List[List[str]],
+    embeddings: OpenAIEmbeddings = None,
+    concurrency: int = None,
+    return_exceptions: bool = False
+) -> List[List[List[float]]]:
+    """
+    Embed prepared batches, keeping up to `concurrency` requests in flight.
+
+    Embedding is bound by HTTP latency, so overlapping round-trips is where
+    the speedup comes from. Each batch is retried independently.
+
+    Args:
+        batches: Texts per embedding request
+        embeddings: Embeddings model whose async client is usable on the running
+                    loop (a loop-scoped client for the configured model if None)
+        concurrency: Max concurrent requests (uses EMBEDDING_CONCURRENCY if None)
+        return_exceptions: Return a failed batch's exception in its slot instead of raising
+
+    Returns:
+        List[List[List[float]]]: Embeddings per batch, in batch order
+    """
+    if embeddings is None:
+        async with loop_embedding_model() as embeddings:
+            return await aembed_batches(batches, embeddings, concurrency, return_exceptions)
+
+    semaphore = asyncio.Semaphore(concurrency or settings.EMBEDDING_CONCURRENCY)
+
+    async def embed_batch(batch: List[str]) -> List[List[float]]:
+        async with semaphore:
+            return await _aembed_batch(batch, embeddings)
+
+    return await asyncio.gather(
+        *(embed_batch(batch) for batch in batches),
+        return_exceptions=return_exceptions
+    )
+
+
+async def abatch_embed_documents(
     texts: List[str],
     embeddings: OpenAIEmbeddings = None,
-    batch_size: int = 100
+    batch_size: Optional[int] = None,
+    concurrency: int = None
 ) -> List[List[float]]:
-    """Generate embeddings for multiple documents with batching and retry logic."""
+    """
+    Generate embeddings for multiple documents, sending batches concurrently.
+
+    Batches are packed by token count (see pack_by_tokens), so each request
+    carries as much text as the API allows, and sent via aembed_batches.
+
+    Args:
+        texts: Texts to embed
+        embeddings: Embeddings model whose async client is usable on the running
+                    loop (a loop-scoped client for the configured model if None)
+        batch_size: Fixed number of texts per request (packs by tokens if None)
+        concurrency: Max concurrent requests (uses EMBEDDING_CONCURRENCY if None)
+
+    Returns:
+        List[List[float]]: Embeddings in the same order as texts
+    """
     if not texts:
         return []
 
-    if embeddings is None:
-        embeddings = get_embedding_model()
+    if batch_size:
+        batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    else:
+        batches = pack_by_tokens(texts, embeddings.model if embeddings is not None else None)
+    results = await aembed_batches(batches, embeddings, concurrency)
 
-    all_embeddings = []
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i:i + batch_size]
-        batch_embeddings = embeddings.embed_documents(batch)
-        all_embeddings.extend(batch_embeddings)
+    return [vector for batch_embeddings in results for vector in batch_embeddings]
 
-    return all_embeddings
+
+def batch_embed_documents(
+    texts: List[str],
+    embeddings: OpenAIEmbeddings = None,
+    batch_size: Optional[int] = None,
+    concurrency: int = None
+) -> List[List[float]]:
+    """
+    Generate embeddings for multiple documents with concurrent batching and retry logic.
+
+    Runs on a fresh event loop, so leave embeddings as None (a loop-scoped client
+    is opened) rather than passing the cached get_embedding_model() instance.
+    """
+    return asyncio.run(abatch_embed_documents(texts, embeddings, batch_size, concurrency))
 
 
 @retry(
@@ -58,6 +278,31 @@ def embed_query(query: str, embeddings: OpenAIEmbeddings = None) -> List[float]:
     return query_embedding
 
 
+@lru_cache(maxsize=1024)
+def _embed_query_cached(query: str, model_name: str) -> Tuple[float, ...]:
+    """Embed a query once per (query, model) pair; tuples keep cached vectors immutable."""
+    return tuple(embed_query(query, get_embedding_model(model_name)))
+
+
+def embed_query_cached(query: str, model_name: str = None) -> List[float]:
+    """Generate embedding for a query, reusing the vector of previously seen queries."""
+    model_name = model_name or settings.OPENAI_EMBEDDING_MODEL
+    return list(_embed_query_cached(query, model_name))
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """Embeddings wrapper that serves query embeddings from the LRU query cache."""
+
+    def __init__(self, embeddings: OpenAIEmbeddings):
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text: str) -> List[float]:
+        return embed_query_cached(text, self.embeddings.model)
+
+
 def get_embedding_dimension(model_name: str = None) -> int:
     """Get the embedding dimension for a given model."""
     model_name = model_name or settings.OPENAI_EMBEDDING_MODEL
@@ -0,0 +1,100 @@
+"""
+Persistent SQLite cache for LLM-extracted ΦΕΚ metadata.
+
+Entries are keyed by sha256(cache version + filename + first-page sample +
+extraction model), so re-ingesting an unchanged PDF skips the metadata LLM
+call entirely.
+SQLite (rather than a JSON file) keeps concurrent writes from the ingestion
+worker processes safe.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+from typing import Dict, Optional
+
+import orjson
+
+from ..config import get_vectorstore_path
+
+METADATA_CACHE_FILENAME = "metadata_cache.sqlite3"
+
+# Bumped when the stored result shape changes (2: the file-name year is kept
+# as publication_year instead of a made-up YYYY-01-01 publication_date)
+METADATA_CACHE_VERSION = 2
+
+_connection = None
+_lock = threading.Lock()
+
+
+def _get_connection() -> sqlite3.Connection:
+    """Open (once) the cache database in the vectorstore directory."""
+    global _connection
+
+    if _connection is None:
+        db_path = get_vectorstore_path() / METADATA_CACHE_FILENAME
+        _connection = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30)
+        _connection.execute(
+            "CREATE TABLE IF NOT EXISTS metadata_cache ("
+            "key TEXT PRIMARY KEY, metadata TEXT)"
+        )
+        _connection.commit()
+
+    return _connection
+
+
+def _reset_connection():
+    """Forked workers open their own connection instead of sharing the parent's."""
+    global _connection, _lock
+    _connection = None
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_connection)
+
+
+def metadata_key(filename: str, text_sample: str, model: str) -> str:
+    """Hash the inputs that determine a metadata extraction result."""
+    return hashlib.sha256(
+        f"v{METADATA_CACHE_VERSION}".encode("utf-8")
+        + filename.encode("utf-8") + text_sample.encode("utf-8") + model.encode("utf-8")
+    ).hexdigest()
+
+
+def get_cached_metadata(key: str) -> Optional[Dict]:
+    """
+    Look up stored metadata.
+
+    Args:
+        key: Cache key from metadata_key()
+
+    Returns:
+        dict: Stored metadata, or None if not cached
+    """
+    with _lock:
+        row = _get_connection().execute(
+            "SELECT metadata FROM metadata_cache WHERE key = ?", (key,)
+        ).fetchone()
+
+    return orjson.loads(row[0]) if row else None
+
+
+def store_metadata(key: str, metadata: Dict):
+    """
+    Store extracted metadata.
+
+    Args:
+        key: Cache key from metadata_key()
+        metadata: Metadata dict (JSON-serializable)
+    """
+    payload = orjson.dumps(metadata).decode("utf-8")
+
+    with _lock:
+        conn = _get_connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO metadata_cache (key, metadata) VALUES (?, ?)",
+            (key, payload)
+        )
+        conn.commit()
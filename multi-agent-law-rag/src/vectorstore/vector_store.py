@@ -3,16 +3,28 @@ FAISS vector store with hybrid search (semantic + BM25).
 """
 
 from typing import List, Dict, Optional
+import asyncio
+from dataclasses import dataclass, field
+import heapq
+import os
 import pickle
+import shutil
+import threading
 from pathlib import Path
+import faiss
+import numpy as np
 import tiktoken
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 from langchain.retrievers import EnsembleRetriever
 from langchain_community.retrievers import BM25Retriever
 from langchain.schema import Document
 
 from ..config import settings, get_vectorstore_path
-from .embeddings import get_embedding_model
+from .embeddings import get_embedding_model, aembed_batches, pack_first_fit_decreasing, CachedQueryEmbeddings
+from .embedding_cache import chunk_hash, get_cached_embeddings, store_embeddings
+from .bm25_index import BM25_DIRNAME, PackedBM25, PackedBM25Retriever
+from .document_processor import publication_timestamp
 
 # Initialize tiktoken encoding for accurate token counting
 try:
@@ -20,6 +32,36 @@ try:
 except:
     _encoding = None
 
+# Bumped whenever documents are added, so cached retrievers know to rebuild
+_corpus_version = 0
+
+# Process-wide vectorstore, loaded from disk once and shared by all agents
+_collection = None
+_collection_lock = threading.Lock()
+
+# Build-time search breadth for HNSW graphs (only affects ingestion time and graph quality)
+HNSW_EF_CONSTRUCTION = 200
+
+# (cache key, (sorted publication_ts, FAISS positions)) for date-restricted search
+_date_index_cache = (None, None)
+
+# (cache key, _CollectionSummary) for ingestion checks and stats
+_summary_cache = (None, None)
+
+# (cache key, {metadata key: (values by FAISS position, present mask)}) for filtered search
+_metadata_columns_cache = (None, {})
+
+
+@dataclass(slots=True)
+class _CollectionSummary:
+    """Per-index aggregates over chunk metadata, so lookups don't rescan the docstore."""
+    count: int = 0
+    sources: set = field(default_factory=set)
+    doc_types: set = field(default_factory=set)
+    authorities: set = field(default_factory=set)
+    earliest: Optional[str] = None
+    latest: Optional[str] = None
+
 
 def estimate_token_count(text: str) -> int:
     """
@@ -39,32 +81,82 @@ def estimate_token_count(text: str) -> int:
         return len(text) // 2
 
 
+def estimate_token_counts(texts: List[str]) -> List[int]:
+    """
+    Count tokens for many texts in one tiktoken call.
+
+    encode_ordinary_batch runs in tiktoken's Rust core across threads, which
+    is much cheaper than one encode() call per text.
+
+    Args:
+        texts: Input texts
+
+    Returns:
+        List[int]: Token count per text
+    """
+    if _encoding is not None:
+        return [len(tokens) for tokens in _encoding.encode_ordinary_batch(texts)]
+    else:
+        # Fallback: conservative estimate for Greek text
+        return [len(text) // 2 for text in texts]
+
+
+def get_corpus_version() -> int:
+    """Get the in-process corpus version (incremented on every add_documents call)."""
+    return _corpus_version
+
+
 def get_faiss_index_path():
     """Get the path to the FAISS index file."""
     vectorstore_path = get_vectorstore_path()
     return vectorstore_path / "faiss_index"
 
 
+def get_bm25_index_path():
+    """Get path to the packed BM25 index directory."""
+    return get_vectorstore_path() / BM25_DIRNAME
+
+
 def get_or_create_collection(embeddings=None):
     """
     Get or create FAISS vectorstore with Greek settings.
 
+    The index is loaded from disk once per process and shared; add_documents
+    and delete_collection keep the shared instance up to date. A missing
+    index is not cached, so the first ingestion is picked up.
+
     Returns:
         FAISS: LangChain FAISS vectorstore instance
     """
+    global _collection
+
+    if _collection is None:
+        with _collection_lock:
+            if _collection is None:
+                _collection = _load_collection(embeddings)
+
+    return _collection
+
+
+def _load_collection(embeddings=None):
+    """Load the FAISS index from disk (None if there is no index yet)."""
     if embeddings is None:
         embeddings = get_embedding_model()
 
     index_path = get_faiss_index_path()
+    _finish_interrupted_save(index_path)
 
-    # Try to load existing index
+    # Try to load existing index (read fully into RAM: FAISS can only memory-map
+    # IVF inverted lists, not the flat, SQ or HNSW indexes built here)
     if index_path.exists():
         try:
             vectorstore = FAISS.load_local(
                 str(index_path),
-                embeddings,
+                CachedQueryEmbeddings(embeddings),
                 allow_dangerous_deserialization=True
             )
+            _backfill_publication_ts(vectorstore)
+            _configure_index(vectorstore.index)
             return vectorstore
         except:
             pass
@@ -74,10 +166,154 @@ def get_or_create_collection(embeddings=None):
     return None
 
 
+def _backfill_publication_ts(vectorstore):
+    """Add numeric publication_ts metadata to chunks from indexes built before it existed."""
+    for doc in vectorstore.docstore._dict.values():
+        if "publication_ts" not in doc.metadata:
+            publication_ts = publication_timestamp(doc.metadata.get("publication_date"))
+            if publication_ts is not None:
+                doc.metadata["publication_ts"] = publication_ts
+
+
+def _save_swap_paths(index_path: Path):
+    """Sibling directories save_collection writes to (".new") and moves aside (".old")."""
+    return index_path.with_name(index_path.name + ".new"), index_path.with_name(index_path.name + ".old")
+
+
+def save_collection(vectorstore):
+    """
+    Save the FAISS index and docstore as one unit.
+
+    Both files are written to a fresh sibling directory that then takes the
+    place of the index directory, so the index is never paired with another
+    save's docstore (FAISS positions map to documents through the docstore).
+    A crash while writing keeps the previous directory untouched; a crash
+    during the swap is completed by _finish_interrupted_save on the next load.
+    """
+    index_path = get_faiss_index_path()
+    new_path, old_path = _save_swap_paths(index_path)
+
+    shutil.rmtree(new_path, ignore_errors=True)
+    vectorstore.save_local(str(new_path))
+
+    shutil.rmtree(old_path, ignore_errors=True)
+    if index_path.exists():
+        os.replace(index_path, old_path)
+    os.replace(new_path, index_path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def _finish_interrupted_save(index_path: Path):
+    """Complete a save_collection swap that was cut short between its two renames."""
+    new_path, old_path = _save_swap_paths(index_path)
+    if index_path.exists() or not old_path.exists():
+        return
+    # The previous index was already moved aside, so the new save is complete
+    if new_path.exists():
+        os.replace(new_path, index_path)
+        shutil.rmtree(old_path, ignore_errors=True)
+    else:
+        os.replace(old_path, index_path)
+
+
+def create_faiss_index(training_vectors: np.ndarray):
+    """
+    Create an empty FAISS index according to FAISS_INDEX_TYPE and FAISS_QUANTIZATION.
+
+    "flat": exhaustive search over every vector.
+    "hnsw": HNSW graph search, visiting O(log N) vectors per query at a small recall cost.
+
+    "none": exact float32 vectors.
+    "sq8": 8-bit scalar quantized vectors (4x smaller, trained on the given vectors).
+
+    Args:
+        training_vectors: float32 array (n, dim) used for dimension and training
+
+    Returns:
+        faiss.Index: Empty index ready for add()
+    """
+    dim = training_vectors.shape[1]
+    index_type = settings.FAISS_INDEX_TYPE.lower()
+    quantization = settings.FAISS_QUANTIZATION.lower()
+
+    if index_type not in ("flat", "hnsw"):
+        raise ValueError(f"Unsupported FAISS_INDEX_TYPE: {settings.FAISS_INDEX_TYPE}")
+    if quantization not in ("none", "sq8"):
+        raise ValueError(f"Unsupported FAISS_QUANTIZATION: {settings.FAISS_QUANTIZATION}")
+
+    if index_type == "hnsw":
+        if quantization == "sq8":
+            index = faiss.IndexHNSWSQ(dim, faiss.ScalarQuantizer.QT_8bit, settings.FAISS_HNSW_M)
+            index.train(training_vectors)
+        else:
+            index = faiss.IndexHNSWFlat(dim, settings.FAISS_HNSW_M)
+        index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+        _configure_index(index)
+        return index
+
+    if quantization == "sq8":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_L2)
+        index.train(training_vectors)
+        return index
+
+    return faiss.IndexFlatL2(dim)
+
+
+def _configure_index(index):
+    """Apply query-time settings that are not fixed at build time (HNSW search breadth)."""
+    if isinstance(index, faiss.IndexHNSW):
+        index.hnsw.efSearch = settings.FAISS_HNSW_EF_SEARCH
+
+
+def _search_params(index, selector, k: int):
+    """Search parameters restricting a search to the selected ids (HNSW needs its own type)."""
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=max(index.hnsw.efSearch, k))
+    return faiss.SearchParameters(sel=selector)
+
+
+def quantize_collection(vectorstore=None) -> bool:
+    """
+    Migrate an existing exact flat index to the configured index.
+
+    Vectors are reconstructed from the current index, the new index (quantizer
+    and/or HNSW graph) is built from all of them, and the index is saved. Does
+    nothing when the configuration is the default flat float32 index or the
+    index was already migrated.
+
+    Returns:
+        bool: True if the index was rebuilt
+    """
+    if settings.FAISS_QUANTIZATION.lower() == "none" and settings.FAISS_INDEX_TYPE.lower() == "flat":
+        return False
+
+    if vectorstore is None:
+        vectorstore = get_or_create_collection()
+
+    if vectorstore is None or not isinstance(vectorstore.index, faiss.IndexFlat):
+        return False
+
+    vectors = vectorstore.index.reconstruct_n(0, vectorstore.index.ntotal)
+    index = create_faiss_index(vectors)
+    index.add(vectors)
+
+    vectorstore.index = index
+    save_collection(vectorstore)
+    print(
+        f"Rebuilt FAISS index ({settings.FAISS_INDEX_TYPE}, {settings.FAISS_QUANTIZATION}, "
+        f"{index.ntotal} vectors)"
+    )
+
+    return True
+
+
 def add_documents(documents: List[Document], vectorstore=None):
     """
     Add documents to FAISS with batch insertion based on token limits.
-    Pre-computes embeddings in batches to stay under OpenAI's 300k token limit.
+    Pre-computes embeddings in batches to stay under OpenAI's 300k token limit,
+    skipping chunks whose embeddings are already in the embedding cache.
+    Batches are embedded concurrently; FAISS is only written afterwards, from
+    this thread.
 
     Args:
         documents: List of Document objects
@@ -86,72 +322,103 @@ def add_documents(documents: List[Document], vectorstore=None):
     Returns:
         FAISS: Updated vectorstore
     """
+    global _corpus_version, _collection
+
     if not documents:
         return vectorstore
 
     embeddings = get_embedding_model()
-    index_path = get_faiss_index_path()
 
     if vectorstore is None:
         vectorstore = get_or_create_collection(embeddings)
 
+    # Reuse stored embeddings for chunks we have already embedded with this model
+    model_id = embeddings.model
+    hashes = [chunk_hash(doc.page_content, model_id) for doc in documents]
+    vectors_by_hash = get_cached_embeddings(hashes)
+
+    pending = []
+    seen = set()
+    for doc, h in zip(documents, hashes):
+        if h not in vectors_by_hash and h not in seen:
+            seen.add(h)
+            pending.append((doc, h))
+
+    print(f"Embedding cache: {len(documents) - len(pending)}/{len(documents)} chunks already embedded")
+
     # Batch documents by token count to avoid OpenAI API limits
     # Using configurable token limit per batch (default 250k, API limit is 300k)
     MAX_TOKENS_PER_BATCH = settings.MAX_TOKENS_PER_EMBEDDING_BATCH
+    # OpenAI also caps the number of inputs per embeddings request (2048)
+    MAX_CHUNKS_PER_BATCH = settings.MAX_CHUNKS_PER_EMBEDDING_BATCH
 
-    batches = []
-    current_batch = []
-    current_token_count = 0
+    token_counts = estimate_token_counts([doc.page_content for doc, _ in pending])
 
-    for doc in documents:
-        doc_tokens = estimate_token_count(doc.page_content)
-
-        # If adding this doc would exceed limit, start new batch
-        if current_token_count + doc_tokens > MAX_TOKENS_PER_BATCH and current_batch:
-            batches.append(current_batch)
-            current_batch = [doc]
-            current_token_count = doc_tokens
-        else:
-            current_batch.append(doc)
-            current_token_count += doc_tokens
+    # First-fit decreasing fills requests tighter than packing in input order
+    batches = [
+        [(pending[i][0], pending[i][1], token_counts[i]) for i in batch]
+        for batch in pack_first_fit_decreasing(token_counts, MAX_TOKENS_PER_BATCH, MAX_CHUNKS_PER_BATCH)
+    ]
 
-    # Add remaining documents
-    if current_batch:
-        batches.append(current_batch)
+    print(f"Processing {len(pending)} chunks in {len(batches)} batch(es)")
 
-    print(f"Processing {len(documents)} chunks in {len(batches)} batch(es)")
-
-    # Process each batch - pre-compute embeddings to control batch size
     for i, batch in enumerate(batches, 1):
-        batch_tokens = sum(estimate_token_count(doc.page_content) for doc in batch)
+        batch_tokens = sum(n_tokens for _, _, n_tokens in batch)
         print(f"  Batch {i}/{len(batches)}: {len(batch)} chunks (~{batch_tokens:,} tokens)")
 
-        # Extract texts for embedding
-        texts = [doc.page_content for doc in batch]
-
-        # Generate embeddings for this batch
-        batch_embeddings = embeddings.embed_documents(texts)
-
-        # Create text-embedding pairs
-        text_embeddings = list(zip(texts, batch_embeddings))
-
-        # If no existing vectorstore, create from first batch
-        if vectorstore is None:
-            # Create FAISS index from pre-computed embeddings
-            vectorstore = FAISS.from_embeddings(
-                text_embeddings=text_embeddings,
-                embedding=embeddings,
-                metadatas=[doc.metadata for doc in batch]
-            )
-        else:
-            # Add pre-computed embeddings to existing vectorstore
-            vectorstore.add_embeddings(
-                text_embeddings=text_embeddings,
-                metadatas=[doc.metadata for doc in batch]
-            )
+    # Send the batches concurrently (bounded by EMBEDDING_CONCURRENCY). No model
+    # is passed: the cached one's async client would outlive this asyncio.run
+    # loop, so aembed_batches opens a client scoped to it.
+    batch_results = asyncio.run(aembed_batches(
+        [[doc.page_content for doc, _, _ in batch] for batch in batches],
+        return_exceptions=True
+    ))
+
+    # Persist every batch that succeeded before surfacing a failure, so a retry
+    # only re-embeds the failed batches. The embedding cache is the ingestion
+    # checkpoint: after a crash, a rerun finds every stored batch there.
+    errors = []
+    for i, (batch, batch_embeddings) in enumerate(zip(batches, batch_results)):
+        batch_results[i] = None
+        if isinstance(batch_embeddings, BaseException):
+            errors.append(batch_embeddings)
+            continue
+        batch_hashes = [h for _, h, _ in batch]
+        # float32 rows instead of lists of Python floats (~6 KB vs ~50 KB per chunk)
+        batch_vectors = np.asarray(batch_embeddings, dtype=np.float32)
+        del batch_embeddings
+        store_embeddings(batch_hashes, batch_vectors, model_id)
+        vectors_by_hash.update(zip(batch_hashes, batch_vectors))
+
+    if errors:
+        raise errors[0]
+
+    # Create text-embedding pairs in original document order
+    vectors = np.vstack([vectors_by_hash[h] for h in hashes])
+    del vectors_by_hash
+    text_embeddings = zip((doc.page_content for doc in documents), vectors)
+    metadatas = [doc.metadata for doc in documents]
+
+    # If no existing vectorstore, create an empty one (quantized index trained on this batch)
+    if vectorstore is None:
+        vectorstore = FAISS(
+            embedding_function=CachedQueryEmbeddings(embeddings),
+            index=create_faiss_index(vectors),
+            docstore=InMemoryDocstore(),
+            index_to_docstore_id={}
+        )
+
+    # Add pre-computed embeddings to the vectorstore
+    vectorstore.add_embeddings(
+        text_embeddings=text_embeddings,
+        metadatas=metadatas
+    )
 
     # Save the index
-    vectorstore.save_local(str(index_path))
+    save_collection(vectorstore)
+    build_bm25_index(vectorstore)
+    _collection = vectorstore
+    _corpus_version += 1
     print(f"Successfully added all documents to vector store")
 
     return vectorstore
@@ -170,7 +437,7 @@ def similarity_search(
         query: Query text
         vectorstore: FAISS instance (creates new if None)
         k: Number of results (uses config if None)
-        filters: Metadata filters (e.g., {"publication_date": {"$gte": "2020-01-01"}})
+        filters: Metadata filters (e.g., {"publication_ts": {"$gte": 1577836800}})
 
     Returns:
         List[Document]: Retrieved documents
@@ -184,45 +451,162 @@ def similarity_search(
     if k is None:
         k = settings.RETRIEVAL_TOP_K
 
-    # FAISS doesn't support filters natively, so we filter after retrieval
-    results = vectorstore.similarity_search(query, k=k*2 if filters else k)
-
-    # Apply metadata filters manually if provided
     if filters:
-        filtered_results = []
-        for doc in results:
-            if _matches_filter(doc.metadata, filters):
-                filtered_results.append(doc)
-                if len(filtered_results) >= k:
-                    break
-        return filtered_results
+        # Evaluate the filter over cached metadata columns, then let FAISS search
+        # only the matching vectors (exact top-k, no over-fetch and post-filter)
+        ids = np.flatnonzero(_filter_mask(vectorstore, filters))
+        return _search_positions(vectorstore, query, ids, k)
 
-    return results[:k]
+    return vectorstore.similarity_search(query, k=k)
 
 
-def _matches_filter(metadata: Dict, filters: Dict) -> bool:
-    """Check if metadata matches the filter criteria."""
-    for key, condition in filters.items():
-        if key not in metadata:
-            return False
+def similarity_search_by_date(
+    query: str,
+    start_ts: int,
+    end_ts: int,
+    vectorstore=None,
+    k: int = None
+) -> List[Document]:
+    """
+    Search only among chunks published within a date range.
+
+    The range is turned into a FAISS ID selector, so the index search itself
+    skips out-of-range vectors instead of over-fetching and post-filtering.
+
+    Args:
+        query: Query text
+        start_ts: Range start (publication_ts, unix seconds, inclusive)
+        end_ts: Range end (publication_ts, unix seconds, inclusive)
+        vectorstore: FAISS instance (creates new if None)
+        k: Number of results (uses config if None)
+
+    Returns:
+        List[Document]: Most similar in-range documents
+    """
+    if vectorstore is None:
+        vectorstore = get_or_create_collection()
+
+    if vectorstore is None:
+        return []
+
+    if k is None:
+        k = settings.RETRIEVAL_TOP_K
+
+    # Candidate FAISS positions for the range: two binary searches, no corpus scan
+    sorted_ts, positions = _get_date_index(vectorstore)
+    lo = np.searchsorted(sorted_ts, start_ts, side="left")
+    hi = np.searchsorted(sorted_ts, end_ts, side="right")
+    return _search_positions(vectorstore, query, positions[lo:hi], k)
+
+
+def _search_positions(vectorstore, query: str, ids: np.ndarray, k: int) -> List[Document]:
+    """Nearest documents to the query among the given FAISS positions (via an ID selector)."""
+    if ids.size == 0:
+        return []
+
+    selector = faiss.IDSelectorBatch(ids)
+    vector = np.asarray([vectorstore.embedding_function.embed_query(query)], dtype=np.float32)
+    _, indices = vectorstore.index.search(
+        vector, min(k, int(ids.size)), params=_search_params(vectorstore.index, selector, k)
+    )
+
+    return [
+        vectorstore.docstore.search(vectorstore.index_to_docstore_id[i])
+        for i in indices[0] if i != -1
+    ]
+
+
+def _get_date_index(vectorstore):
+    """
+    Date index over the FAISS positions, built once per loaded index.
+
+    Returns:
+        tuple: (publication_ts sorted ascending, FAISS position for each entry);
+               undated chunks are left out
+    """
+    global _date_index_cache
+
+    key = (_corpus_version, id(vectorstore), vectorstore.index.ntotal)
+    if _date_index_cache[0] != key:
+        docstore = vectorstore.docstore
+        timestamps = []
+        positions = []
+        for position, doc_id in vectorstore.index_to_docstore_id.items():
+            publication_ts = docstore.search(doc_id).metadata.get("publication_ts")
+            if publication_ts is not None:
+                timestamps.append(publication_ts)
+                positions.append(position)
+
+        timestamps = np.array(timestamps, dtype=np.int64)
+        order = np.argsort(timestamps, kind="stable")
+        _date_index_cache = (key, (timestamps[order], np.array(positions, dtype=np.int64)[order]))
+
+    return _date_index_cache[1]
+
 
-        value = metadata[key]
+def _get_metadata_column(vectorstore, key: str):
+    """
+    One metadata field for every FAISS position, built once per loaded index.
+
+    Returns:
+        tuple: (object array of values, bool mask of positions that have the field)
+    """
+    global _metadata_columns_cache
+
+    cache_key = (_corpus_version, id(vectorstore), vectorstore.index.ntotal)
+    if _metadata_columns_cache[0] != cache_key:
+        _metadata_columns_cache = (cache_key, {})
+
+    columns = _metadata_columns_cache[1]
+    if key not in columns:
+        size = vectorstore.index.ntotal
+        values = np.empty(size, dtype=object)
+        present = np.zeros(size, dtype=bool)
+        docstore = vectorstore.docstore
+        for position, doc_id in vectorstore.index_to_docstore_id.items():
+            metadata = docstore.search(doc_id).metadata
+            if key in metadata:
+                values[position] = metadata[key]
+                present[position] = True
+        columns[key] = (values, present)
+
+    return columns[key]
+
+
+def _filter_mask(vectorstore, filters: Dict) -> np.ndarray:
+    """
+    Evaluate metadata filters for every FAISS position at once.
+
+    Supports direct equality and the $gte / $lte / $eq operators; a chunk
+    without a filtered field never matches.
+
+    Returns:
+        np.ndarray: Bool mask over FAISS positions
+    """
+    mask = np.ones(vectorstore.index.ntotal, dtype=bool)
+
+    for key, condition in filters.items():
+        values, present = _get_metadata_column(vectorstore, key)
+        mask &= present
+        candidates = np.flatnonzero(mask)
+        selected = values[candidates]
 
-        # Handle different filter operators
         if isinstance(condition, dict):
+            keep = np.ones(candidates.size, dtype=bool)
             for op, target in condition.items():
-                if op == "$gte" and value < target:
-                    return False
-                elif op == "$lte" and value > target:
-                    return False
-                elif op == "$eq" and value != target:
-                    return False
+                if op == "$gte":
+                    keep &= (selected >= target).astype(bool)
+                elif op == "$lte":
+                    keep &= (selected <= target).astype(bool)
+                elif op == "$eq":
+                    keep &= (selected == target).astype(bool)
         else:
             # Direct equality
-            if value != condition:
-                return False
+            keep = (selected == condition).astype(bool)
 
-    return True
+        mask[candidates[~keep]] = False
+
+    return mask
 
 
 def get_hybrid_retriever(vectorstore=None, documents: List[Document] = None, k: int = 5):
@@ -253,18 +637,13 @@ def get_hybrid_retriever(vectorstore=None, documents: List[Document] = None, k:
         search_kwargs={"k": k}
     )
 
-    # BM25 keyword retriever
-    # If documents not provided, get all from vectorstore
-    if documents is None:
-        # Get documents from FAISS docstore
-        documents = list(vectorstore.docstore._dict.values())
+    # BM25 keyword retriever (packed index over the whole vectorstore if documents not provided)
+    bm25_retriever = get_bm25_retriever(vectorstore, documents=documents, k=k)
 
-    if not documents:
+    if bm25_retriever is None:
         # If no documents, return just semantic retriever
         return semantic_retriever
 
-    bm25_retriever = BM25Retriever.from_documents(documents, k=k)
-
     # Ensemble with configurable weights
     hybrid_retriever = EnsembleRetriever(
         retrievers=[semantic_retriever, bm25_retriever],
@@ -274,16 +653,149 @@ def get_hybrid_retriever(vectorstore=None, documents: List[Document] = None, k:
     return hybrid_retriever
 
 
+def build_bm25_index(vectorstore) -> PackedBM25:
+    """
+    Tokenize every chunk in the docstore into the packed BM25 index and save it.
+
+    Args:
+        vectorstore: FAISS instance
+
+    Returns:
+        PackedBM25: The new index
+    """
+    doc_ids = list(vectorstore.index_to_docstore_id.values())
+    texts = [vectorstore.docstore.search(doc_id).page_content for doc_id in doc_ids]
+
+    bm25_index = PackedBM25.build(texts, doc_ids)
+    bm25_index.save(get_bm25_index_path())
+    return bm25_index
+
+
+def get_bm25_retriever(vectorstore=None, documents: List[Document] = None, k: int = 5):
+    """
+    Create BM25 keyword retriever.
+
+    Without explicit documents, the packed on-disk index built at ingestion is
+    memory-mapped (and rebuilt if missing or out of date with the docstore).
+
+    Args:
+        vectorstore: FAISS instance
+        documents: List of documents for BM25 (if None, uses the whole vectorstore)
+        k: Number of results
+
+    Returns:
+        BaseRetriever: Keyword retriever, or None if there are no documents
+    """
+    if documents is not None:
+        if not documents:
+            return None
+        return BM25Retriever.from_documents(documents, k=k)
+
+    if vectorstore is None:
+        vectorstore = get_or_create_collection()
+    if vectorstore is None or not vectorstore.index_to_docstore_id:
+        return None
+
+    # The packed index stores the docstore ids it was built from, so any change
+    # to the docstore (not only its size) triggers a rebuild
+    bm25_index = PackedBM25.load(get_bm25_index_path())
+    if bm25_index is None or bm25_index.doc_ids != list(vectorstore.index_to_docstore_id.values()):
+        bm25_index = build_bm25_index(vectorstore)
+
+    return PackedBM25Retriever(index=bm25_index, docstore=vectorstore.docstore, k=k)
+
+
+def reciprocal_rank_fusion(
+    result_lists: List[List[Document]],
+    weights: List[float] = None,
+    c: int = 60,
+    k: int = None
+) -> List[Document]:
+    """
+    Fuse ranked result lists with weighted Reciprocal Rank Fusion.
+
+    Same scoring as LangChain's EnsembleRetriever: each document scores
+    sum(weight / (rank + c)) over the lists it appears in, deduplicated by content.
+
+    Args:
+        result_lists: Ranked document lists (e.g. dense hits, BM25 hits)
+        weights: Weight per list (defaults to equal weights)
+        c: RRF constant
+        k: Number of documents to return (all if None); selected with a
+           size-k heap instead of sorting every candidate
+
+    Returns:
+        List[Document]: Fused documents, best first
+    """
+    if weights is None:
+        weights = [1.0 / len(result_lists)] * len(result_lists)
+
+    scores = {}
+    docs_by_key = {}
+
+    for docs, weight in zip(result_lists, weights):
+        for rank, doc in enumerate(docs, 1):
+            key = doc.page_content
+            scores[key] = scores.get(key, 0.0) + weight / (rank + c)
+            docs_by_key.setdefault(key, doc)
+
+    if k is None:
+        ranked_keys = sorted(scores, key=scores.get, reverse=True)
+    else:
+        ranked_keys = heapq.nlargest(k, scores, key=scores.get)
+    return [docs_by_key[key] for key in ranked_keys]
+
+
 def delete_collection(vectorstore=None):
     """Delete the entire FAISS index."""
+    global _collection, _corpus_version
+
+    _collection = None
+    _corpus_version += 1
     index_path = get_faiss_index_path()
 
-    if index_path.exists():
-        import shutil
-        try:
-            shutil.rmtree(index_path)
-        except:
-            pass
+    for path in (index_path, *_save_swap_paths(index_path), get_bm25_index_path()):
+        if path.exists():
+            try:
+                shutil.rmtree(path)
+            except:
+                pass
+
+
+def _get_collection_summary(vectorstore) -> _CollectionSummary:
+    """
+    Metadata summary of the docstore, built once per loaded index.
+
+    Rebuilt only when the corpus changes (same keying as the date index), so
+    repeated "already ingested?" checks during bulk ingestion are set lookups
+    instead of a scan over every chunk.
+    """
+    global _summary_cache
+
+    key = (_corpus_version, id(vectorstore), vectorstore.index.ntotal)
+    if _summary_cache[0] != key:
+        summary = _CollectionSummary()
+        dates = []
+
+        for doc in vectorstore.docstore._dict.values():
+            meta = doc.metadata
+            summary.count += 1
+            if meta.get("source"):
+                summary.sources.add(meta["source"])
+            if meta.get("doc_type"):
+                summary.doc_types.add(meta["doc_type"])
+            if meta.get("authority"):
+                summary.authorities.add(meta["authority"])
+            if meta.get("publication_date"):
+                dates.append(meta["publication_date"])
+
+        if dates:
+            summary.earliest = min(dates)
+            summary.latest = max(dates)
+
+        _summary_cache = (key, summary)
+
+    return _summary_cache[1]
 
 
 def get_collection_stats(vectorstore=None) -> Dict[str, any]:
@@ -305,43 +817,17 @@ def get_collection_stats(vectorstore=None) -> Dict[str, any]:
         }
 
     try:
-        # Get all documents from FAISS docstore
-        documents = list(vectorstore.docstore._dict.values())
-        count = len(documents)
-
-        if count > 0:
-            # Extract unique document types
-            doc_types = set()
-            authorities = set()
-            dates = []
-
-            for doc in documents:
-                meta = doc.metadata
-                if meta.get("doc_type"):
-                    doc_types.add(meta["doc_type"])
-                if meta.get("authority"):
-                    authorities.add(meta["authority"])
-                if meta.get("publication_date"):
-                    dates.append(meta["publication_date"])
-
-            stats = {
-                "total_documents": count,
-                "document_types": list(doc_types),
-                "authorities": list(authorities),
-                "date_range": {
-                    "earliest": min(dates) if dates else None,
-                    "latest": max(dates) if dates else None,
-                },
-            }
-        else:
-            stats = {
-                "total_documents": 0,
-                "document_types": [],
-                "authorities": [],
-                "date_range": {"earliest": None, "latest": None},
-            }
+        summary = _get_collection_summary(vectorstore)
 
-        return stats
+        return {
+            "total_documents": summary.count,
+            "document_types": list(summary.doc_types),
+            "authorities": list(summary.authorities),
+            "date_range": {
+                "earliest": summary.earliest,
+                "latest": summary.latest,
+            },
+        }
 
     except Exception as e:
         return {
@@ -368,11 +854,6 @@ def check_if_document_exists(source_name: str, vectorstore=None) -> bool:
         return False
 
     try:
-        # Check all documents in docstore
-        documents = list(vectorstore.docstore._dict.values())
-        for doc in documents:
-            if doc.metadata.get("source") == source_name:
-                return True
-        return False
+        return source_name in _get_collection_summary(vectorstore).sources
     except:
         return False
@@ -0,0 +1,4 @@
+import os
+
+# Settings require an API key at import time; tests never reach the API
+os.environ.setdefault("OPENAI_API_KEY", "sk-test")
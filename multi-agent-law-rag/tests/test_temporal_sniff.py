@@ -0,0 +1,67 @@
+from datetime import datetime
+
+import pytest
+
+from src.agents.temporal_agent import _TEMPORAL_SNIFF_RE, TemporalAgent
+
+# Phrases the fallback patterns or the LLM prompt examples handle; each one
+# must get past the pre-check, or the query is never date-filtered
+TEMPORAL_QUERIES = [
+    # _DATE_PATTERNS
+    "νόμοι μετά το 2020",
+    "laws after 2020",
+    "νόμοι πριν το 2015",
+    "laws before 2015",
+    "νόμοι το 2024",
+    "laws in 2024",
+    "ΦΕΚ 2023",
+    # _RELATIVE_PATTERNS
+    "νόμοι που ψηφίστηκαν πέρσι",
+    "laws from last year",
+    "νόμοι φέτος",
+    "laws passed this year",
+    "πρόσφατοι νόμοι",
+    "προσφατες αλλαγες",
+    "recent laws",
+    "recently passed tax laws",
+    "τελευταία 3 χρόνια",
+    "last 5 years",
+    # _RANGE_PATTERNS
+    "μεταξύ 2020 και 2023",
+    "between 2020 and 2023",
+    "2020-2023",
+    "από 2018 έως 2021",
+    # LLM prompt examples and free-form cues
+    "νεότερα νόμια",
+    "παλιοί νόμοι",
+    "newer labour laws",
+    "latest regulations",
+    "older rulings",
+    "oldest decrees",
+    "earlier decisions",
+    "modern legislation",
+    "laws of the past decade",
+]
+
+NON_TEMPORAL_QUERIES = [
+    "νόμοι για φόρους",
+    "τι ισχύει για την άδεια μητρότητας",
+    "tax law for freelancers",
+]
+
+
+@pytest.mark.parametrize("query", TEMPORAL_QUERIES)
+def test_sniff_passes_temporal_queries(query):
+    assert _TEMPORAL_SNIFF_RE.search(query)
+
+
+@pytest.mark.parametrize("query", NON_TEMPORAL_QUERIES)
+def test_sniff_skips_non_temporal_queries(query):
+    assert not _TEMPORAL_SNIFF_RE.search(query)
+
+
+@pytest.mark.parametrize("query", TEMPORAL_QUERIES + NON_TEMPORAL_QUERIES)
+def test_pattern_matches_imply_sniff_match(query):
+    agent = TemporalAgent(use_llm_extraction=False)
+    if agent._extract_date_with_patterns(query, datetime(2025, 1, 1)) is not None:
+        assert _TEMPORAL_SNIFF_RE.search(query)
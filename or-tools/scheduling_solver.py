@@ -3,9 +3,11 @@
 Created on Sat Sep 20 17:10:20 2025
 @author: TEO
 """
+import csv
+import os
 from ortools.sat.python import cp_model
 from collections import defaultdict
-import pandas as pd
+import numpy as np
 
 class SchedulingSolver:
     def __init__(self, employees, employee_by_role, days, shifts, roles):
@@ -15,16 +17,28 @@ class SchedulingSolver:
         self.DAYS = days
         self.SHIFTS = shifts
         self.ROLES = roles
-        self.shifts = {}
+        self.emp_index = {emp['id']: i for i, emp in enumerate(employees)}
+        self.shift_index = {shift: s for s, shift in enumerate(shifts)}
+        # Rows of the shift array belonging to each role
+        self.role_idx = {
+            role: np.array([self.emp_index[emp['id']] for emp in employee_by_role[role]], dtype=np.int64)
+            for role in roles
+        }
+        self.shifts = None
         self.create_variables()
         self.add_constraints()
         
     def create_variables(self):
-        """Create decision variables for each employee, day, and shift"""
-        for emp in self.employees:
+        """Create decision variables for each employee, day, and shift
+        
+        Stored as an (employee, day, shift) array so constraints can slice it
+        instead of hashing a tuple key per variable.
+        """
+        self.shifts = np.empty((len(self.employees), self.DAYS, len(self.SHIFTS)), dtype=object)
+        for e, emp in enumerate(self.employees):
             for day in range(self.DAYS):
-                for shift in self.SHIFTS:
-                    self.shifts[(emp['id'], day, shift)] = self.model.NewBoolVar(
+                for s, shift in enumerate(self.SHIFTS):
+                    self.shifts[e, day, s] = self.model.NewBoolVar(
                         f"emp_{emp['id']}_day_{day}_shift_{shift}"
                     )
     
@@ -38,81 +52,79 @@ class SchedulingSolver:
     
     def add_shift_requirements(self):
         """Ensure each shift has the required number of people per role"""
+        supervisors = self.role_idx['supervisor']
+        mechanics = self.role_idx['mechanic']
+        workers = self.role_idx['worker']
+        morning = self.shift_index['morning']
+        day_shift = self.shift_index['day']
+        night = self.shift_index['night']
+        
         for day in range(self.DAYS):
             # Morning shift: 1 supervisor, 1 mechanic, 1 worker
-            self.model.Add(sum(self.shifts[(emp['id'], day, 'morning')] 
-                              for emp in self.employee_by_role['supervisor']) == 1)
-            self.model.Add(sum(self.shifts[(emp['id'], day, 'morning')] 
-                              for emp in self.employee_by_role['mechanic']) == 1)
-            self.model.Add(sum(self.shifts[(emp['id'], day, 'morning')] 
-                              for emp in self.employee_by_role['worker']) == 1)
+            self.model.AddExactlyOne(self.shifts[supervisors, day, morning].tolist())
+            self.model.AddExactlyOne(self.shifts[mechanics, day, morning].tolist())
+            self.model.AddExactlyOne(self.shifts[workers, day, morning].tolist())
             
             # Day shift: 1 mechanic, 2 workers
-            self.model.Add(sum(self.shifts[(emp['id'], day, 'day')] 
-                              for emp in self.employee_by_role['mechanic']) == 1)
-            self.model.Add(sum(self.shifts[(emp['id'], day, 'day')] 
-                              for emp in self.employee_by_role['worker']) == 2)
+            self.model.AddExactlyOne(self.shifts[mechanics, day, day_shift].tolist())
+            self.model.Add(cp_model.LinearExpr.Sum(self.shifts[workers, day, day_shift].tolist()) == 2)
             
             # Night shift: 1 mechanic, 1 worker
-            self.model.Add(sum(self.shifts[(emp['id'], day, 'night')] 
-                              for emp in self.employee_by_role['mechanic']) == 1)
-            self.model.Add(sum(self.shifts[(emp['id'], day, 'night')] 
-                              for emp in self.employee_by_role['worker']) == 1)
+            self.model.AddExactlyOne(self.shifts[mechanics, day, night].tolist())
+            self.model.AddExactlyOne(self.shifts[workers, day, night].tolist())
     
     def add_one_shift_per_day(self):
         """Each person can work at most one shift per day"""
-        for emp in self.employees:
+        for e in range(len(self.employees)):
             for day in range(self.DAYS):
-                self.model.Add(sum(self.shifts[(emp['id'], day, shift)] 
-                                 for shift in self.SHIFTS) <= 1)
+                self.model.AddAtMostOne(self.shifts[e, day].tolist())
     
     def add_no_morning_after_night(self):
         """No morning shift if worked night shift the previous day"""
-        for emp in self.employees:
+        morning = self.shift_index['morning']
+        night = self.shift_index['night']
+        for e in range(len(self.employees)):
             for day in range(1, self.DAYS):
-                self.model.Add(self.shifts[(emp['id'], day-1, 'night')] + 
-                             self.shifts[(emp['id'], day, 'morning')] <= 1)
+                self.model.AddAtMostOne([self.shifts[e, day-1, night], self.shifts[e, day, morning]])
     
     def add_max_consecutive_days(self):
         """No more than 6 consecutive working days"""
-        for emp in self.employees:
+        # With at most one shift per day (add_one_shift_per_day), the shifts of a
+        # day sum to 1 exactly when the employee works, so a 7-day window can be
+        # bounded directly without a helper variable per employee and day
+        for e in range(len(self.employees)):
             for start_day in range(self.DAYS - 6):
                 # For each 7-day window, ensure at least 1 day off
-                working_days = []
-                for day in range(start_day, start_day + 7):
-                    day_working = self.model.NewBoolVar(f"emp_{emp['id']}_working_day_{day}")
-                    self.model.Add(sum(self.shifts[(emp['id'], day, shift)] 
-                                     for shift in self.SHIFTS) >= day_working)
-                    self.model.Add(sum(self.shifts[(emp['id'], day, shift)] 
-                                     for shift in self.SHIFTS) <= day_working * 3)
-                    working_days.append(day_working)
-                
-                self.model.Add(sum(working_days) <= 6)
+                window = self.shifts[e, start_day:start_day + 7].ravel().tolist()
+                self.model.Add(cp_model.LinearExpr.Sum(window) <= 6)
     
     def add_workload_balance(self):
         """Try to balance workload among employees of the same role"""
         for role in self.ROLES:
-            role_employees = self.employee_by_role[role]
-            if len(role_employees) <= 1:
+            role_idx = self.role_idx[role]
+            if len(role_idx) <= 1:
                 continue
                 
             # Calculate total shifts for each employee in this role
-            employee_totals = []
-            for emp in role_employees:
-                total_shifts = sum(self.shifts[(emp['id'], day, shift)] 
-                                 for day in range(self.DAYS) for shift in self.SHIFTS)
-                employee_totals.append(total_shifts)
+            employee_totals = [
+                cp_model.LinearExpr.Sum(self.shifts[e].ravel().tolist()) for e in role_idx
+            ]
             
-            # Add constraints to keep workloads balanced (within 2 shifts of each other)
-            for i in range(len(employee_totals)):
-                for j in range(i + 1, len(employee_totals)):
-                    diff = self.model.NewIntVar(-2, 2, f"diff_{role}_{i}_{j}")
-                    self.model.Add(employee_totals[i] - employee_totals[j] == diff)
+            # Keep workloads balanced (within 2 shifts of each other): bounding the
+            # spread between the busiest and least busy employee covers every pair
+            max_shifts = self.model.NewIntVar(0, self.DAYS * len(self.SHIFTS), f"max_shifts_{role}")
+            min_shifts = self.model.NewIntVar(0, self.DAYS * len(self.SHIFTS), f"min_shifts_{role}")
+            self.model.AddMaxEquality(max_shifts, employee_totals)
+            self.model.AddMinEquality(min_shifts, employee_totals)
+            self.model.Add(max_shifts - min_shifts <= 2)
     
     def solve(self):
         """Solve the scheduling problem"""
         solver = cp_model.CpSolver()
         solver.parameters.max_time_in_seconds = 120
+        # Run CP-SAT's portfolio of search strategies on every core
+        solver.parameters.num_workers = os.cpu_count() or 1
+        solver.parameters.linearization_level = 2
         
         status = solver.Solve(self.model)
         
@@ -126,84 +138,92 @@ class SchedulingSolver:
     
     def export_to_csv(self, solver):
         """Export solution to CSV files"""
-        # Create schedule data for CSV
-        schedule_data = []
-        employee_stats = defaultdict(int)
+        # Read the whole solution in one call: assigned[e, day, s] is True when
+        # employee e works shift s on that day
+        assigned = solver.BooleanValues(self.shifts.ravel().tolist()).to_numpy(dtype=bool)
+        assigned = assigned.reshape(self.shifts.shape)
+        
+        names = [emp['fullName'] for emp in self.employees]
+        employee_stats = dict(zip(names, assigned.sum(axis=(1, 2)).tolist()))
+        
+        # staff[role][day][s] lists the names on that shift, in employee order,
+        # from one nonzero pass over each role's (day, shift, employee) matrix
+        staff = {}
+        for role, role_idx in self.role_idx.items():
+            cells = [[[] for _ in self.SHIFTS] for _ in range(self.DAYS)]
+            for day, s, e in zip(*np.nonzero(assigned[role_idx].transpose(1, 2, 0))):
+                cells[day][s].append(names[role_idx[e]])
+            staff[role] = cells
         
         days_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
         
-        for day in range(self.DAYS):
-            day_name = days_names[day % 7]
-            week_number = (day // 7) + 1
+        # Stream rows straight to the CSV files (same line endings pandas wrote)
+        schedule_filename = f"schedule_{self.DAYS}_days.csv"
+        schedule_rows = 0
+        with open(schedule_filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(
+                f,
+                fieldnames=['Day_Number', 'Day_Name', 'Week_Number', 'Shift', 'Supervisors', 'Mechanics', 'Workers'],
+                lineterminator=os.linesep,
+            )
+            writer.writeheader()
             
-            for shift in self.SHIFTS:
-                # Get people assigned to this shift
-                supervisors = []
-                mechanics = []
-                workers = []
-                
-                for emp in self.employees:
-                    if solver.Value(self.shifts[(emp['id'], day, shift)]):
-                        employee_stats[emp['fullName']] += 1
-                        
-                        if emp['role'] == 'supervisor':
-                            supervisors.append(emp['fullName'])
-                        elif emp['role'] == 'mechanic':
-                            mechanics.append(emp['fullName'])
-                        elif emp['role'] == 'worker':
-                            workers.append(emp['fullName'])
+            for day in range(self.DAYS):
+                day_name = days_names[day % 7]
+                week_number = (day // 7) + 1
                 
-                # Add row to schedule data
-                schedule_data.append({
-                    'Day_Number': day + 1,
-                    'Day_Name': day_name,
-                    'Week_Number': week_number,
-                    'Shift': shift.upper(),
-                    'Supervisors': ', '.join(supervisors) if supervisors else '',
-                    'Mechanics': ', '.join(mechanics) if mechanics else '',
-                    'Workers': ', '.join(workers) if workers else ''
-                })
-        
-        # Create schedule DataFrame and save to CSV
-        schedule_df = pd.DataFrame(schedule_data)
-        schedule_filename = f"schedule_{self.DAYS}_days.csv"
-        schedule_df.to_csv(schedule_filename, index=False)
+                for s, shift in enumerate(self.SHIFTS):
+                    writer.writerow({
+                        'Day_Number': day + 1,
+                        'Day_Name': day_name,
+                        'Week_Number': week_number,
+                        'Shift': shift.upper(),
+                        'Supervisors': ', '.join(staff['supervisor'][day][s]),
+                        'Mechanics': ', '.join(staff['mechanic'][day][s]),
+                        'Workers': ', '.join(staff['worker'][day][s])
+                    })
+                    schedule_rows += 1
         print(f"Schedule saved to: {schedule_filename}")
         
-        # Create workload distribution data
-        workload_data = []
+        # Write workload distribution
         role_stats = defaultdict(list)
         
         for emp in self.employees:
             role_stats[emp['role']].append((emp['fullName'], employee_stats[emp['fullName']]))
         
-        for role in self.ROLES:
-            role_employees = sorted(role_stats[role], key=lambda x: x[1], reverse=True)
-            shift_counts = [shifts for _, shifts in role_employees]
+        workload_filename = f"workload_distribution_{self.DAYS}_days.csv"
+        workload_rows = 0
+        with open(workload_filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(
+                f,
+                fieldnames=['Role', 'Employee_Name', 'Total_Shifts', 'Role_Average', 'Role_Min', 'Role_Max', 'Role_Range'],
+                lineterminator=os.linesep,
+            )
+            writer.writeheader()
             
-            if shift_counts:
-                avg_shifts = sum(shift_counts) / len(shift_counts)
-                min_shifts = min(shift_counts)
-                max_shifts = max(shift_counts)
+            for role in self.ROLES:
+                role_employees = sorted(role_stats[role], key=lambda x: x[1], reverse=True)
+                shift_counts = [shifts for _, shifts in role_employees]
                 
-                for name, shifts in role_employees:
-                    workload_data.append({
-                        'Role': role.upper(),
-                        'Employee_Name': name,
-                        'Total_Shifts': shifts,
-                        'Role_Average': round(avg_shifts, 1),
-                        'Role_Min': min_shifts,
-                        'Role_Max': max_shifts,
-                        'Role_Range': f"{min_shifts} - {max_shifts}"
-                    })
-        
-        # Create workload DataFrame and save to CSV
-        workload_df = pd.DataFrame(workload_data)
-        workload_filename = f"workload_distribution_{self.DAYS}_days.csv"
-        workload_df.to_csv(workload_filename, index=False)
+                if shift_counts:
+                    avg_shifts = sum(shift_counts) / len(shift_counts)
+                    min_shifts = min(shift_counts)
+                    max_shifts = max(shift_counts)
+                    
+                    for name, shifts in role_employees:
+                        writer.writerow({
+                            'Role': role.upper(),
+                            'Employee_Name': name,
+                            'Total_Shifts': shifts,
+                            'Role_Average': round(avg_shifts, 1),
+                            'Role_Min': min_shifts,
+                            'Role_Max': max_shifts,
+                            'Role_Range': f"{min_shifts} - {max_shifts}"
+                        })
+                        workload_rows += 1
         print(f"Workload distribution saved to: {workload_filename}")
         
         # Print summary to terminal
         print(f"\nFiles created:")
-        print(f"  - {schedule_filename} ({len(schedule_df)} rows)")
-        print(f"  - {workload_filename} ({len(workload_df)} rows)")
+        print(f"  - {schedule_filename} ({schedule_rows} rows)")
+        print(f"  - {workload_filename} ({workload_rows} rows)")